@@ -0,0 +1,105 @@
+import asyncio
+import json
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+
+class RequestBatcher:
+    """musicu.fcg 请求合并器
+
+    musicu.fcg 支持在一次 POST 中携带多个 req_N 模块请求。
+    在 window 秒内提交的、公共参数（comm 等）与请求头相同的请求会被合并为一次请求，
+    响应按模块拆分后分别返回给各自的调用方。
+    """
+
+    def __init__(self, send: Callable[[Dict, Dict], Awaitable[Dict]], window: float = 0.01, max_batch: int = 20):
+        """初始化请求合并器
+
+        Args:
+            send: 实际发送请求的协程函数，参数为 (payload, headers)
+            window: 合并窗口（秒）
+            max_batch: 单次请求最多合并的模块数
+        """
+        self.send = send
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[Tuple[int, str], "_Batch"] = {}
+
+    @staticmethod
+    def _is_module(value) -> bool:
+        return isinstance(value, dict) and "module" in value and "method" in value
+
+    async def submit(self, payload: Dict, headers: Dict = None) -> Dict:
+        """提交请求，等待合并后的响应
+
+        Args:
+            payload: 原始请求体
+            headers: 请求头
+
+        Returns:
+            Dict: 与单独请求时结构相同的响应
+        """
+        headers = headers or {}
+        common = {key: value for key, value in payload.items() if not self._is_module(value)}
+        modules = {key: value for key, value in payload.items() if self._is_module(value)}
+
+        loop = asyncio.get_running_loop()
+        group = (id(loop), json.dumps([common, headers], sort_keys=True, ensure_ascii=False))
+        batch = self._pending.get(group)
+        if batch is None:
+            batch = self._pending[group] = _Batch(common, headers)
+            loop.create_task(self._flush_later(group, batch))
+
+        future = loop.create_future()
+        batch.entries.append((modules, future))
+        batch.size += len(modules)
+        if batch.size >= self.max_batch:
+            self._pending.pop(group, None)
+            loop.create_task(self._flush(batch))
+        return await future
+
+    async def _flush_later(self, group: Tuple[int, str], batch: "_Batch"):
+        await asyncio.sleep(self.window)
+        if self._pending.get(group) is batch:
+            del self._pending[group]
+            await self._flush(batch)
+
+    async def _flush(self, batch: "_Batch"):
+        """发送合并后的请求并分发响应"""
+        payload = dict(batch.common)
+        routes: List[Dict[str, str]] = []
+        for modules, _ in batch.entries:
+            route = {}
+            for key, module in modules.items():
+                merged_key = f"req_{len(payload) - len(batch.common)}"
+                payload[merged_key] = module
+                route[merged_key] = key
+            routes.append(route)
+
+        try:
+            response = await self.send(payload, batch.headers)
+        except Exception as e:
+            for _, future in batch.entries:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        shared = {key: value for key, value in response.items() if not key.startswith("req_")}
+        for (_, future), route in zip(batch.entries, routes):
+            if future.done():
+                continue
+            result = dict(shared)
+            for merged_key, key in route.items():
+                if merged_key in response:
+                    result[key] = response[merged_key]
+            future.set_result(result)
+
+
+class _Batch:
+    """等待发送的一组请求"""
+    __slots__ = ("common", "headers", "entries", "size")
+
+    def __init__(self, common: Dict, headers: Dict):
+        self.common = common
+        self.headers = headers
+        self.entries: List[Tuple[Dict, asyncio.Future]] = []
+        self.size = 0
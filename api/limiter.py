@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from utils.config import config
+
+
+class AdaptiveLimiter:
+    """客户端限流器
+
+    令牌桶限制每秒发出的请求数，AIMD 并发窗口限制同时进行的请求数：
+    请求正常完成时窗口加性增大（每个窗口的请求完成后约增加1），
+    遇到 429、5xx、网络错误或响应过慢时窗口乘性减小，从而让吞吐量稳定在上游可承受的最大值附近。
+
+    状态由线程锁保护，等待方按各自的事件循环唤醒，可以在多个线程的事件循环中共用同一个实例。
+    """
+
+    def __init__(self, rate: float = 10, burst: int = 20, initial_limit: int = 8, min_limit: int = 1,
+                 max_limit: int = 32, latency_threshold: float = 3.0, backoff: float = 0.5):
+        """初始化限流器
+
+        Args:
+            rate: 每秒补充的令牌数，不大于0时不限制速率
+            burst: 令牌桶容量，即允许的突发请求数
+            initial_limit: 初始并发窗口
+            min_limit: 并发窗口下限
+            max_limit: 并发窗口上限
+            latency_threshold: 超过该耗时（秒）的请求视为拥塞信号
+            backoff: 拥塞时并发窗口的缩小比例
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_threshold = latency_threshold
+        self.backoff = backoff
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._inflight = 0
+        self._last_decrease = 0.0
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def inflight(self) -> int:
+        """进行中的请求数"""
+        return self._inflight
+
+    def _refill(self, now: float):
+        if self.rate > 0:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """等待令牌与并发窗口，获取后必须调用 release"""
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                has_slot = self._inflight < int(self.limit)
+                if has_slot and (self.rate <= 0 or self._tokens >= 1):
+                    self._tokens -= 1
+                    self._inflight += 1
+                    return
+                waiter = None
+                if not has_slot:
+                    waiter = loop.create_future()
+                    self._waiters.append((loop, waiter))
+            if waiter is None:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+            else:
+                await waiter
+
+    def release(self, latency: float, status_code: Optional[int] = None, failed: bool = False):
+        """释放并发窗口，并根据请求结果调整窗口大小
+
+        Args:
+            latency: 请求耗时（秒）
+            status_code: 响应状态码，请求未完成（如被取消）时为空
+            failed: 请求是否因网络错误失败
+        """
+        with self._lock:
+            self._inflight -= 1
+            if failed or status_code == 429 or (status_code or 0) >= 500 or \
+                    (status_code is not None and latency > self.latency_threshold):
+                now = time.monotonic()
+                # 同一轮拥塞中先后失败的请求只缩小一次窗口
+                if now - self._last_decrease > latency:
+                    self.limit = max(self.min_limit, self.limit * self.backoff)
+                    self._last_decrease = now
+            elif status_code is not None:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            waiters, self._waiters = self._waiters, []
+        for loop, waiter in waiters:
+            try:
+                loop.call_soon_threadsafe(self._wake, waiter)
+            except RuntimeError:
+                # 等待方的事件循环已关闭
+                pass
+
+    @staticmethod
+    def _wake(waiter: asyncio.Future):
+        if not waiter.done():
+            waiter.set_result(None)
+
+
+# 全局限流器实例，所有 QQMusicAPI 实例共用同一个速率与并发窗口
+api_limiter = AdaptiveLimiter(config.API_RATE_LIMIT, config.API_RATE_BURST, config.API_CONCURRENCY_INITIAL,
+                              config.API_CONCURRENCY_MIN, config.API_CONCURRENCY_MAX, config.API_LATENCY_THRESHOLD)
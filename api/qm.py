@@ -1,14 +1,30 @@
+import asyncio
+import copy
+import json
 import random
 import time
+import unicodedata
 from base64 import encode
-from typing import Dict
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List
 
 import httpx
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+from api.batcher import RequestBatcher
+from api.limiter import api_limiter
 from utils.config import config
+from utils.http_client import http_clients
+from utils.json_decoder import JsonDecoder, resolve_backend
+from utils.lyrics_cache import lyrics_cache
 from utils.menum import RequestMethod, SearchType
 from utils.parser import MusicDataParser
+from utils.ttl_cache import TTLCache
+
+# 全局缓存实例，机器人与界面中的各个 QQMusicAPI 实例共用
+# 歌曲下载链接缓存，键为 (songmid, filetype, cookie)
+url_cache = TTLCache(config.URL_CACHE_MAX_ENTRIES, config.URL_CACHE_TTL)
+# 搜索结果缓存，键为 (规范化关键词, search_type, page, limit)
+search_cache = TTLCache(config.SEARCH_CACHE_MAX_ENTRIES, config.SEARCH_CACHE_TTL)
 
 
 class QQMusicAPI:
@@ -63,6 +79,12 @@ class QQMusicAPI:
             },
         }
 
+        # 批量获取歌曲URL时每次请求包含的歌曲数
+        self.vkey_batch_size = 50
+        # 分页获取专辑、歌单歌曲时每页的歌曲数与最多同时预取的页数
+        self.page_size = 100
+        self.page_prefetch = 3
+
         self.uin = str(random.randint(1000000000, 9999999999))
         self.default_headers = {
             "Accept": "*/*",
@@ -81,19 +103,27 @@ class QQMusicAPI:
             "User-Agent": user_agent or "Mozilla/5.0 (iPhone; CPU iPhone OS 13_3_1 like Mac OS X; zh-CN) AppleWebKit/537.51.1 (KHTML, like Gecko) Mobile/17D50 UCBrowser/12.8.2.1268 Mobile AliApp(TUnionSDK/0.1.20.3)"
         }
 
-        self.client = httpx.AsyncClient(
-            limits=httpx.Limits(max_connections=100,
-                                max_keepalive_connections=20),
-            timeout=httpx.Timeout(10)
-        )
+        # 共享 HTTP 客户端，与其他模块复用同一主机的连接
+        self.http_clients = http_clients
         self.parser = MusicDataParser()
+        self.json_decoder = JsonDecoder(resolve_backend(config.API_JSON_BACKEND))
+        self.lyrics_cache = lyrics_cache
+        self.url_cache = url_cache
+        self.search_cache = search_cache
+        # 进行中的请求，用于合并同时发出的相同请求
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        self.limiter = api_limiter
+        # 合并窗口为0时不合并请求
+        self.batcher = RequestBatcher(self._send_musicu, config.API_BATCH_WINDOW,
+                                      config.API_BATCH_SIZE) if config.API_BATCH_WINDOW > 0 else None
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10),
-           retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError)))
     async def _make_request(self, url: str, method: str, payload: Dict = None, params: Dict = None,
                             headers: Dict = None) -> Dict:
         """通用异步请求方法
 
+        同一时间内完全相同的请求（URL、方法、请求体、查询参数与头部均相同）只发送一次，
+        所有调用方共享同一个响应。
+
         Args:
             url (str): 请求URL
             method (str): 请求方法 (POST/GET)
@@ -104,20 +134,80 @@ class QQMusicAPI:
         Returns:
             Dict: 响应JSON数据
         """
+        loop = asyncio.get_running_loop()
+        key = (id(loop), url, method,
+               json.dumps([payload, params, headers], sort_keys=True, ensure_ascii=False, default=str))
+        task = self._inflight.get(key)
+        if task is None:
+            task = self._inflight[key] = loop.create_task(self._fetch(url, method, payload, params, headers))
+            task.add_done_callback(lambda done: self._request_done(key, done))
+        # 某个调用方被取消时不影响其他共享该请求的调用方
+        return await asyncio.shield(task)
+
+    def _request_done(self, key: tuple, task: asyncio.Task):
+        """请求结束后移出进行中列表，所有调用方都已取消时也读取异常，避免未处理异常告警"""
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            task.exception()
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10),
+           retry=retry_if_exception_type((httpx.RequestError, httpx.HTTPStatusError)))
+    async def _fetch(self, url: str, method: str, payload: Dict = None, params: Dict = None,
+                     headers: Dict = None) -> Dict:
+        """发送请求，失败时重试
+
+        Args:
+            url (str): 请求URL
+            method (str): 请求方法 (POST/GET)
+            payload (Dict): 请求体数据
+            params (Dict): 查询参数
+            headers (Dict): 自定义头部
+
+        Returns:
+            Dict: 响应JSON数据
+        """
+        await self.limiter.acquire()
+        start = time.monotonic()
+        status_code = None
+        failed = False
         try:
             custom_headers = {**self.default_headers, **(headers or {})}
 
-            response = await self.client.request(
+            response = await self.http_clients.get(url).request(
                 method,
                 url,
                 json=payload if method == RequestMethod.POST else None,
                 params=params if method == RequestMethod.GET else None,
                 headers=custom_headers
             )
+            status_code = response.status_code
             response.raise_for_status()
-            return response.json()
+            return self.json_decoder.decode(response.content, payload)
         except httpx.RequestError as e:
+            failed = True
             raise Exception(f"请求失败: {str(e)}")
+        finally:
+            self.limiter.release(time.monotonic() - start, status_code, failed)
+
+    async def _send_musicu(self, payload: Dict, headers: Dict = None) -> Dict:
+        """直接向 musicu.fcg 发送请求"""
+        return await self._make_request(self.base_url, RequestMethod.POST, payload, headers=headers)
+
+    async def _request_musicu(self, payload: Dict, headers: Dict = None) -> Dict:
+        """向 musicu.fcg 发送模块请求
+
+        启用请求合并时，与同一时间窗口内的其他请求合并为一次请求发送。
+
+        Args:
+            payload (Dict): 请求体数据
+            headers (Dict): 自定义头部
+
+        Returns:
+            Dict: 响应JSON数据
+        """
+        if self.batcher is None:
+            return await self._send_musicu(payload, headers)
+        return await self.batcher.submit(payload, headers)
 
     async def search(self, query: str, search_type: SearchType = SearchType.SONG, page: int = 1,
                      limit: int = 10) -> Dict:
@@ -132,6 +222,11 @@ class QQMusicAPI:
         Returns:
             Dict: 解析后的搜索结果
         """
+        cache_key = (self._normalize_query(query), int(search_type), page, limit)
+        cached = self.search_cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
         payload = {
             "comm": {"uin": self.uin, "format": "json", "ct": 23, "cv": 0},
             "req_0": {
@@ -146,8 +241,27 @@ class QQMusicAPI:
                 }
             }
         }
-        response = await self._make_request(self.base_url, RequestMethod.POST, payload)
-        return self.parser.parse_search_result(response, search_type)
+        response = await self._request_musicu(payload)
+        result = self.parser.parse_search_result(response, search_type)
+        # 只缓存搜索模块成功返回的结果，模块失败时的空结果不缓存
+        module = response.get('req_0')
+        if result.get('code') == 0 and isinstance(module, dict) and module.get('code') == 0 and 'data' in module:
+            self.search_cache.set(cache_key, copy.deepcopy(result))
+        return result
+
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """规范化搜索关键词，用作缓存键
+
+        统一全角/半角字符与大小写，并合并多余的空白。
+
+        Args:
+            query (str): 搜索关键词
+
+        Returns:
+            str: 规范化后的关键词
+        """
+        return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
 
     async def get_album_songs(self, album_mid: str, begin: int = 0, num: int = -1) -> Dict:
         """异步获取专辑歌曲列表
@@ -160,15 +274,7 @@ class QQMusicAPI:
         Returns:
             Dict: 解析后的专辑歌曲列表
         """
-        payload = {
-            "comm": {"uin": self.uin, "format": "json", "ct": 24, "cv": 4747474},
-            "req_0": {
-                "module": "music.musichallAlbum.AlbumSongList",
-                "method": "GetAlbumSongList",
-                "param": {"albumMid": album_mid, "begin": begin, "num": num, "order": 2}
-            }
-        }
-        response = await self._make_request(self.base_url, RequestMethod.POST, payload)
+        response = await self._request_musicu(self._album_payload(album_mid, begin, num))
         return self.parser.parse_album(response)
 
     async def get_playlist(self, disstid: int, song_begin: int = 0, song_num: int = -1) -> Dict:
@@ -182,7 +288,23 @@ class QQMusicAPI:
         Returns:
             Dict: 解析后的歌单信息
         """
-        payload = {
+        response = await self._request_musicu(self._playlist_payload(disstid, song_begin, song_num))
+        return self.parser.parse_playlist(response)
+
+    def _album_payload(self, album_mid: str, begin: int, num: int) -> Dict:
+        """构建 GetAlbumSongList 请求体"""
+        return {
+            "comm": {"uin": self.uin, "format": "json", "ct": 24, "cv": 4747474},
+            "req_0": {
+                "module": "music.musichallAlbum.AlbumSongList",
+                "method": "GetAlbumSongList",
+                "param": {"albumMid": album_mid, "begin": begin, "num": num, "order": 2}
+            }
+        }
+
+    def _playlist_payload(self, disstid: int, song_begin: int, song_num: int) -> Dict:
+        """构建 uniform_get_Dissinfo 请求体"""
+        return {
             "comm": {"uin": self.uin, "format": "json"},
             "req_0": {
                 "module": "music.srfDissInfo.aiDissInfo",
@@ -191,8 +313,109 @@ class QQMusicAPI:
                     "disstid": disstid, "song_begin": song_begin, "song_num": song_num, "tag": 1, "userinfo": 1}
             }
         }
-        response = await self._make_request(self.base_url, RequestMethod.POST, payload)
-        return self.parser.parse_playlist(response)
+
+    async def _album_page(self, album_mid: str, begin: int, num: int) -> Dict:
+        """获取一页专辑歌曲，歌曲在迭代时逐首解析"""
+        response = await self._request_musicu(self._album_payload(album_mid, begin, num))
+        return self.parser.parse_album_page(response)
+
+    async def _playlist_page(self, disstid: int, begin: int, num: int) -> Dict:
+        """获取一页歌单歌曲，歌曲在迭代时逐首解析"""
+        response = await self._request_musicu(self._playlist_payload(disstid, begin, num))
+        return self.parser.parse_playlist_page(response)
+
+    def iter_album_songs(self, album_mid: str, page_size: int = None, prefetch: int = None) -> AsyncIterator[Dict]:
+        """分页获取专辑歌曲，按顺序逐首返回
+
+        Args:
+            album_mid (str): 专辑MID
+            page_size (int): 每页歌曲数，默认 self.page_size
+            prefetch (int): 最多同时预取的页数，默认 self.page_prefetch
+
+        Returns:
+            AsyncIterator[Dict]: 与 get_album_songs 中 songList 元素结构相同的歌曲信息
+        """
+        return self._iter_pages(lambda begin, num: self._album_page(album_mid, begin, num),
+                                'songList', 'totalNum', page_size, prefetch)
+
+    def iter_playlist_songs(self, disstid: int, page_size: int = None, prefetch: int = None) -> AsyncIterator[Dict]:
+        """分页获取歌单歌曲，按顺序逐首返回
+
+        Args:
+            disstid (int): 歌单ID
+            page_size (int): 每页歌曲数，默认 self.page_size
+            prefetch (int): 最多同时预取的页数，默认 self.page_prefetch
+
+        Returns:
+            AsyncIterator[Dict]: 与 get_playlist 中 songs 元素结构相同的歌曲信息
+        """
+        return self._iter_pages(lambda begin, num: self._playlist_page(disstid, begin, num),
+                                'songs', 'total_song_num', page_size, prefetch)
+
+    async def _iter_pages(self, fetch: Callable[[int, int], Awaitable[Dict]], songs_key: str, total_key: str,
+                          page_size: int = None, prefetch: int = None) -> AsyncIterator[Dict]:
+        """分页获取歌曲列表
+
+        第一页返回后即开始产出歌曲；根据总数并发预取后续页面，同时进行的请求不超过 prefetch 个。
+        总数未知时逐页获取，直到某页不足 page_size 首。每页的歌曲在产出时才逐首解析，不为整页构建解析结果列表。
+
+        Args:
+            fetch: 获取一页数据的协程函数，参数为 (开始位置, 数量)
+            songs_key (str): 解析结果中歌曲迭代器的键
+            total_key (str): 解析结果中歌曲总数的键
+            page_size (int): 每页歌曲数
+            prefetch (int): 最多同时预取的页数
+
+        Returns:
+            AsyncIterator[Dict]: 歌曲信息
+        """
+        page_size = page_size or self.page_size
+        prefetch = max(1, prefetch or self.page_prefetch)
+
+        async def fetch_page(begin: int) -> Iterator[Dict]:
+            result = await fetch(begin, page_size)
+            if result.get('code') != 0:
+                raise Exception(f"获取歌曲列表失败: {result.get('error', result.get('code'))}")
+            return result[songs_key]
+
+        first = await fetch(0, page_size)
+        if first.get('code') != 0:
+            raise Exception(f"获取歌曲列表失败: {first.get('error', first.get('code'))}")
+        count = 0
+        for song in first[songs_key]:
+            count += 1
+            yield song
+
+        total = first.get(total_key, 0)
+        if not total:
+            begin = page_size
+            while count >= page_size:
+                count = 0
+                for song in await fetch_page(begin):
+                    count += 1
+                    yield song
+                begin += page_size
+            return
+
+        begins = iter(range(page_size, total, page_size))
+        pending = []
+        try:
+            for begin in begins:
+                pending.append(asyncio.ensure_future(fetch_page(begin)))
+                if len(pending) >= prefetch:
+                    break
+            while pending:
+                songs = await pending.pop(0)
+                begin = next(begins, None)
+                if begin is not None:
+                    pending.append(asyncio.ensure_future(fetch_page(begin)))
+                for song in songs:
+                    yield song
+        finally:
+            # 提前停止迭代或出错时取消尚未完成的预取
+            for task in pending:
+                if not task.cancel() and not task.cancelled():
+                    task.exception()
 
     async def get_word_by_word_lyrics(self, songmid: str = None, songID: int = None, album_name: str = None,
                                       singer_name: str = None, song_name: str = None) -> Dict:
@@ -234,6 +457,12 @@ class QQMusicAPI:
         if song_name:
             param["songName"] = encode(song_name)
 
+        # 仅按 songmid 查询时使用缓存
+        cache_key = None if songID else songmid
+        cached = self.lyrics_cache.get(cache_key, "qrc")
+        if cached is not None:
+            return cached
+
         payload = {
             "comm": {"uin": self.uin},
             "music.musichallSong.PlayLyricInfo.GetPlayLyricInfo": {
@@ -242,8 +471,11 @@ class QQMusicAPI:
                 "param": param
             }
         }
-        response = await self._make_request(self.base_url, RequestMethod.POST, payload)
-        return self.parser.parse_word_by_word_lyrics(response)
+        response = await self._request_musicu(payload)
+        result = await self.parser.parse_word_by_word_lyrics(response)
+        if result['code'] == 0:
+            self.lyrics_cache.set(cache_key, "qrc", result)
+        return result
 
     async def get_lyrics(self, songmid: str) -> Dict:
         """异步获取普通歌词（未加密）
@@ -254,6 +486,10 @@ class QQMusicAPI:
         Returns:
             Dict: 解析后的歌词数据
         """
+        cached = self.lyrics_cache.get(songmid, "lrc")
+        if cached is not None:
+            return cached
+
         params = {
             "_": time.time(),
             "format": "json",
@@ -264,7 +500,10 @@ class QQMusicAPI:
         }
         headers = {"Referer": "https://y.qq.com/"}
         response = await self._make_request(self.lyric_url, RequestMethod.GET, params=params, headers=headers)
-        return self.parser.parse_lyrics(response)
+        result = self.parser.parse_lyrics(response)
+        if result['code'] == 0:
+            self.lyrics_cache.set(songmid, "lrc", result)
+        return result
 
     async def get_song_url(self, songmid: str, filetype: str = '128', cookie: str = config.QQMUSIC_COOKIE) -> Dict:
         """异步获取歌曲URL
@@ -280,17 +519,113 @@ class QQMusicAPI:
         if cookie is None:
             cookie = config.QQMUSIC_COOKIE
 
+        cache_key = (songmid, filetype, cookie)
+        cached = self.url_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        headers = {"Cookie": cookie} if cookie else {}
+        response = await self._request_musicu(self._vkey_payload([songmid], filetype), headers)
+        result = self.parser.parse_song_url(response)
+        if result['code'] == 0 and result['url']:
+            self.url_cache.set(cache_key, result, self._url_ttl(result['expiration']))
+        elif songmid in self._songmids_without_purl(response):
+            # 接口正常返回但没有下载链接（无版权、需要会员等），短时间内不再重复请求
+            self.url_cache.set(cache_key, result, config.URL_CACHE_NEGATIVE_TTL)
+        return dict(result)
+
+    async def get_song_urls(self, songmids: List[str], filetype: str = '128',
+                            cookie: str = config.QQMUSIC_COOKIE) -> Dict[str, str]:
+        """批量获取歌曲URL，每次请求解析多首歌曲
+
+        Args:
+            songmids (List[str]): 歌曲MID列表
+            filetype (str): 文件类型 ('m4a'/'128'/'320'/'flac')
+            cookie (str): Cookie
+
+        Returns:
+            Dict[str, str]: 歌曲MID到下载链接的映射，未获取到链接的歌曲不包含在内
+        """
+        if cookie is None:
+            cookie = config.QQMUSIC_COOKIE
+        headers = {"Cookie": cookie} if cookie else {}
+
+        song_urls = {}
+        missing = []
+        for songmid in dict.fromkeys(songmids):
+            cached = self.url_cache.get((songmid, filetype, cookie))
+            if cached is None:
+                missing.append(songmid)
+            elif cached['code'] == 0 and cached['url']:
+                song_urls[songmid] = cached['url']
+
+        chunks = [missing[i:i + self.vkey_batch_size] for i in range(0, len(missing), self.vkey_batch_size)]
+        responses = await asyncio.gather(
+            *[self._request_musicu(self._vkey_payload(chunk, filetype), headers) for chunk in chunks],
+            return_exceptions=True
+        )
+
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                continue
+            result = self.parser.parse_song_urls(response)
+            if result['code'] == -1:
+                continue
+            ttl = self._url_ttl(result['expiration'])
+            without_purl = self._songmids_without_purl(response)
+            for songmid in chunk:
+                url = result['urls'].get(songmid)
+                if url:
+                    song_urls[songmid] = url
+                    self.url_cache.set((songmid, filetype, cookie),
+                                       {'code': 0, 'url': url, 'expiration': result['expiration']}, ttl)
+                elif songmid in without_purl:
+                    self.url_cache.set((songmid, filetype, cookie),
+                                       {'code': -1, 'error': '未找到文件路径'}, config.URL_CACHE_NEGATIVE_TTL)
+        return song_urls
+
+    @staticmethod
+    def _songmids_without_purl(response: Dict) -> set:
+        """返回接口正常返回但没有下载链接的歌曲MID，用于判断是否可以缓存获取失败的结果
+
+        模块请求失败（如 req_1.code 非0或缺少 data）属于临时错误，不计入其中。
+
+        Args:
+            response (Dict): CgiGetVkey 的响应数据
+
+        Returns:
+            set: 没有 purl 的歌曲MID集合
+        """
+        module = response.get('req_1')
+        if not isinstance(module, dict) or module.get('code') != 0 or not isinstance(module.get('data'), dict):
+            return set()
+        return {info.get('songmid') for info in module['data'].get('midurlinfo') or [] if not info.get('purl')}
+
+    @staticmethod
+    def _url_ttl(expiration: float) -> float:
+        """计算下载链接的缓存有效期，在 vkey 过期前提前失效
+
+        Args:
+            expiration (float): 接口返回的 vkey 有效期（秒），为0表示未知
+
+        Returns:
+            float: 缓存有效期（秒）
+        """
+        ttl = min(expiration, config.URL_CACHE_TTL) if expiration else config.URL_CACHE_TTL
+        return ttl - config.URL_CACHE_MARGIN
+
+    def _vkey_payload(self, songmids: List[str], filetype: str) -> Dict:
+        """构建 CgiGetVkey 请求体"""
         file_info = self.file_config[filetype]
-        file = f"{file_info['s']}{songmid}{songmid}{file_info['e']}"
-        payload = {
+        return {
             "req_1": {
                 "module": "vkey.GetVkeyServer",
                 "method": "CgiGetVkey",
                 "param": {
-                    "filename": [file],
+                    "filename": [f"{file_info['s']}{songmid}{songmid}{file_info['e']}" for songmid in songmids],
                     "guid": "10000",
-                    "songmid": [songmid],
-                    "songtype": [0],
+                    "songmid": songmids,
+                    "songtype": [0] * len(songmids),
                     "uin": self.uin,
                     "loginflag": 1,
                     "platform": "20"
@@ -299,9 +634,6 @@ class QQMusicAPI:
             "loginUin": self.uin,
             "comm": {"uin": self.uin, "format": "json", "ct": 24, "cv": 0}
         }
-        headers = {"Cookie": cookie} if cookie else {}
-        response = await self._make_request(self.base_url, "POST", payload, headers=headers)
-        return self.parser.parse_song_url(response)
 
     async def get_singer_albums(self, singermid: str) -> Dict:
         """获取歌手的专辑信息
@@ -332,7 +664,7 @@ class QQMusicAPI:
                 "ct": 23
             }
         }
-        return await self._make_request(self.base_url, RequestMethod.POST, payload)
+        return await self._request_musicu(payload)
 
     async def get_song_image_url(self, album_mid: str) -> str:
         """获取歌曲图片
@@ -373,7 +705,7 @@ class QQMusicAPI:
                 "url": (None, url)
             }
 
-            response = await self.client.post(
+            response = await self.http_clients.get(api_url).post(
                 api_url,
                 files=files,
                 headers=headers
@@ -0,0 +1,189 @@
+"""decryptor 包解密基准
+
+使用固定随机种子生成的合成数据(无需网络与真实 QQ 音乐数据), 统计各算法、各实现的吞吐量(MB/s 与 blocks/s),
+结果以 JSON 输出, 便于在不同提交之间对比。
+指定 --verify 时先用随机分组把各 DES 实现与逐位参考实现逐一比对, 并检查 qrc_encrypt/qrc_decrypt 往返结果。
+
+用法(在项目根目录):
+    python -m benchmarks.bench_decryptor [--repeat 3] [--output result.json] [--verify 100000]
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import zlib
+
+from decryptor import DES_BACKENDS, KRC_KEY, QRC_KEY, krc_decrypt, qmc1, qrc_decrypt, qrc_decrypt_many, qrc_encrypt
+from decryptor.eapi import AES_BACKENDS, aes_encrypt, eapi_response_decrypt
+from decryptor.tripledes import DECRYPT, ENCRYPT
+from utils.menum import DesBackend
+
+SEED = 20240101
+EAPI_KEY = b'e82ckenh8dichen8'
+
+# 每种实现使用的数据量(字节), 逐位实现的参考 DES 很慢, 只用少量数据
+DES_SIZES = {
+    DesBackend.REFERENCE: 4 * 1024,
+    DesBackend.TABLE: 64 * 1024,
+    DesBackend.NUMPY: 4 * 1024 * 1024,
+}
+QRC_SIZE = 64 * 1024
+QRC_BATCH = 100
+XOR_SIZE = 16 * 1024 * 1024
+AES_SIZES = {"PYAES": 256 * 1024, "CRYPTOGRAPHY": 16 * 1024 * 1024}
+
+
+def measure(func, repeat: int) -> float:
+    """返回 repeat 次运行中的最短耗时"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def result(cipher: str, backend: str, size: int, block_size: int, seconds: float) -> dict:
+    return {
+        "cipher": cipher,
+        "backend": backend,
+        "bytes": size,
+        "seconds": seconds,
+        "mb_per_s": size / seconds / 1024 / 1024,
+        "blocks_per_s": size / block_size / seconds,
+    }
+
+
+def make_qrc(rng: random.Random, size: int) -> str:
+    """生成约 size 字节密文的合成 QRC 数据(hex)"""
+    return qrc_encrypt("".join(rng.choice("abcdefghijklmnopqrstuvwxyz[]:.0123456789\n") for _ in range(size * 2)))
+
+
+def make_krc(rng: random.Random, size: int) -> bytes:
+    """生成约 size 字节的合成 KRC 数据"""
+    data = zlib.compress(rng.randbytes(size // 2).hex().encode("utf-8"))
+    key = (KRC_KEY * (len(data) // len(KRC_KEY) + 1))[:len(data)]
+    return b"krc1" + (int.from_bytes(data, "little") ^ int.from_bytes(key, "little")).to_bytes(len(data), "little")
+
+
+def run(repeat: int) -> list[dict]:
+    rng = random.Random(SEED)
+    results = []
+
+    for backend, des in DES_BACKENDS.items():
+        size = DES_SIZES[backend]
+        data = rng.randbytes(size)
+        schedule = des.tripledes_key_setup(QRC_KEY, DECRYPT)
+        seconds = measure(lambda: des.tripledes_crypt_blocks(data, schedule), repeat)
+        results.append(result("tripledes", backend.name, size, 8, seconds))
+
+    encrypted_qrc = make_qrc(rng, QRC_SIZE)
+    size = len(encrypted_qrc) // 2
+    seconds = measure(lambda: qrc_decrypt(encrypted_qrc), repeat)
+    results.append(result("qrc_decrypt", DesBackend.TABLE.name, size, 8, seconds))
+
+    batch = [make_qrc(rng, QRC_SIZE // QRC_BATCH) for _ in range(QRC_BATCH)]
+    size = sum(len(encrypted_qrc) // 2 for encrypted_qrc in batch)
+    seconds = measure(lambda: qrc_decrypt_many(batch), repeat)
+    backend = DesBackend.NUMPY if DesBackend.NUMPY in DES_BACKENDS else DesBackend.TABLE
+    results.append(result("qrc_decrypt_many", backend.name, size, 8, seconds))
+
+    data = bytearray(rng.randbytes(XOR_SIZE))
+    seconds = measure(lambda: qmc1.qmc1_decrypt(data), repeat)
+    results.append(result("qmc1", "NUMPY" if qmc1.np is not None else "INT", XOR_SIZE, 1, seconds))
+
+    encrypted_krc = make_krc(rng, XOR_SIZE)
+    seconds = measure(lambda: krc_decrypt(encrypted_krc), repeat)
+    results.append(result("krc_decrypt", "INT", len(encrypted_krc), 1, seconds))
+
+    for backend in AES_BACKENDS:
+        size = AES_SIZES[backend.name]
+        encrypted = aes_encrypt(rng.randbytes(size - 16), EAPI_KEY, backend)
+        seconds = measure(lambda: eapi_response_decrypt(encrypted, backend), repeat)
+        results.append(result("eapi_aes", backend.name, len(encrypted), 16, seconds))
+
+    return results
+
+
+def verify(blocks: int) -> list[str]:
+    """用随机分组比对各 DES 实现与参考实现, 并检查 QRC 加解密往返
+
+    :param blocks: 每种实现、每种模式比对的分组数
+    :return: 不一致项的描述, 为空表示全部一致
+    """
+    rng = random.Random(SEED)
+    reference = DES_BACKENDS[DesBackend.REFERENCE]
+    failures = []
+
+    for mode in (ENCRYPT, DECRYPT):
+        key = rng.randbytes(24)
+        # 参考实现很慢, 按批比对, 避免一次生成过多数据
+        for start in range(0, blocks, 4096):
+            data = rng.randbytes(min(4096, blocks - start) * 8)
+            expected = reference.tripledes_crypt_blocks(data, reference.tripledes_key_setup(key, mode))
+            for backend, des in DES_BACKENDS.items():
+                if backend != DesBackend.REFERENCE and \
+                        des.tripledes_crypt_blocks(data, des.tripledes_key_setup(key, mode)) != expected:
+                    failures.append(f"tripledes {backend.name} mode={mode} key={key.hex()} offset={start}")
+
+    texts = ["", "a", "[00:00.00]歌词\n" * 100, rng.randbytes(5000).hex()]
+    for backend in DES_BACKENDS:
+        for text in texts:
+            encrypted_qrc = qrc_encrypt(text, backend)
+            if qrc_decrypt(encrypted_qrc, backend=DesBackend.REFERENCE) != text:
+                failures.append(f"qrc_encrypt {backend.name} len={len(text)}")
+            if qrc_decrypt(encrypted_qrc, backend=backend) != text:
+                failures.append(f"qrc_decrypt {backend.name} len={len(text)}")
+
+    # 批量解密时各歌词的分组跨越分段边界, 需按歌词边界切分
+    batch = texts + [rng.randbytes(100_000).hex()] + texts
+    encrypted_batch = [qrc_encrypt(text) for text in batch]
+    for backend in DES_BACKENDS:
+        if backend != DesBackend.REFERENCE and qrc_decrypt_many(encrypted_batch, backend=backend) != batch:
+            failures.append(f"qrc_decrypt_many {backend.name}")
+    return failures
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="decryptor 包解密基准")
+    parser.add_argument("--repeat", type=int, default=3, help="每项重复次数, 取最短耗时")
+    parser.add_argument("--output", help="JSON 输出文件, 默认输出到标准输出")
+    parser.add_argument("--verify", type=int, default=0, metavar="BLOCKS",
+                        help="基准前用 BLOCKS 个随机分组校验各 DES 实现与参考实现一致")
+    args = parser.parse_args()
+
+    if args.verify:
+        failures = verify(args.verify)
+        if failures:
+            print("\n".join(failures), file=sys.stderr)
+            return 1
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": run(args.repeat),
+    }
+    text = json.dumps(report, indent=4, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
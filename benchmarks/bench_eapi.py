@@ -0,0 +1,35 @@
+"""eapi 响应解密基准, 对比各 AES 实现
+
+用随机数据模拟多 MB 的加密响应体, 输出每种实现的解密吞吐量。
+pyaes 为纯 Python 实现, 大约每秒几百 KB, 响应较大时耗时较长。
+
+用法(在项目根目录):
+    python -m benchmarks.bench_eapi [--sizes 1 2 4]
+"""
+import argparse
+import os
+import time
+
+from decryptor.eapi import AES_BACKENDS, aes_encrypt, eapi_response_decrypt
+
+EAPI_KEY = b'e82ckenh8dichen8'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="eapi 响应解密基准")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4], help="响应大小(MB)")
+    args = parser.parse_args()
+
+    for size_mb in args.sizes:
+        plain = os.urandom(size_mb * 1024 * 1024)
+        encrypted = aes_encrypt(plain, EAPI_KEY)
+        for backend in AES_BACKENDS:
+            start = time.perf_counter()
+            decrypted = eapi_response_decrypt(encrypted, backend)
+            elapsed = time.perf_counter() - start
+            assert decrypted == plain
+            print(f"{size_mb:4d} MB  {backend.name:<12}  {elapsed:9.3f} s  {size_mb / elapsed:9.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""musicu.fcg 响应解码基准, 对比各 JSON 实现解码并解析大歌单的耗时与峰值内存
+
+使用固定随机种子生成的合成歌单响应(字段结构与 uniform_get_Dissinfo 返回的歌曲条目相近),
+对每种实现统计 解码 + MusicDataParser.parse_playlist 的最短耗时与 tracemalloc 峰值内存,
+MSGSPEC 额外区分完整解码与按字段结构的部分解码。
+
+用法(在项目根目录):
+    python -m benchmarks.bench_json [--songs 1000 5000] [--repeat 3]
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+from utils.json_decoder import JSON_BACKENDS, JsonDecoder
+from utils.menum import JsonBackend
+from utils.parser import MusicDataParser
+
+SEED = 20240101
+PAYLOAD = {
+    "comm": {"uin": "0", "format": "json"},
+    "req_0": {"module": "music.srfDissInfo.aiDissInfo", "method": "uniform_get_Dissinfo", "param": {}},
+}
+
+
+def make_song(rng: random.Random, index: int) -> dict:
+    """生成一首歌曲条目, 除解析器用到的字段外, 还带有接口实际返回的大量其他字段"""
+    singer_id = rng.randrange(1000)
+    album_id = rng.randrange(5000)
+    return {
+        "id": 100000 + index, "type": 0, "mid": f"{index:014X}", "name": f"歌曲 {index}",
+        "title": f"歌曲 {index}", "subtitle": "", "interval": rng.randrange(120, 400), "isonly": 0,
+        "language": 0, "genre": 1, "index_cd": 0, "index_album": rng.randrange(1, 15), "time_public": "2020-01-01",
+        "status": 0, "fnote": 4009, "url": "", "bpm": rng.randrange(60, 180), "version": 0, "trace": "",
+        "singer": [{"id": singer_id, "mid": f"S{singer_id:013X}", "name": f"歌手 {singer_id}", "title": f"歌手 {singer_id}",
+                    "type": 0, "uin": 0, "pmid": ""}],
+        "album": {"id": album_id, "mid": f"A{album_id:013X}", "name": f"专辑 {album_id}", "title": f"专辑 {album_id}",
+                  "subtitle": "", "time_public": "2020-01-01", "pmid": f"A{album_id:013X}_1"},
+        "mv": {"id": 0, "vid": "", "name": "", "title": "", "vt": 0},
+        "ksong": {"id": 0, "mid": ""},
+        "file": {"media_mid": f"{index:014X}", "size_24aac": 0, "size_48aac": rng.randrange(10 ** 6),
+                 "size_96aac": rng.randrange(10 ** 6), "size_192ogg": rng.randrange(10 ** 7),
+                 "size_192aac": rng.randrange(10 ** 7), "size_128mp3": rng.randrange(10 ** 7),
+                 "size_320mp3": rng.randrange(10 ** 7), "size_ape": 0, "size_flac": rng.randrange(10 ** 8),
+                 "size_dts": 0, "size_try": 0, "try_begin": 0, "try_end": 0, "url": "",
+                 "size_hires": 0, "hires_sample": 0, "hires_bitdepth": 0, "b_30s": 0, "e_30s": 0,
+                 "size_96ogg": rng.randrange(10 ** 6), "size_360ra": [], "size_dolby": 0, "size_new": [0] * 8},
+        "pay": {"pay_month": 1, "price_track": 200, "price_album": 0, "pay_play": 1, "pay_down": 1,
+                "pay_status": 0, "time_free": 0},
+        "action": {"switch": 17413891, "msgid": 14, "alert": 2, "icons": 8667004, "msgshare": 0, "msgfav": 0,
+                   "msgdown": 0, "msgpay": 6, "switch2": 0, "icon2": 0},
+        "volume": {"gain": -7.4, "peak": 0.98, "lra": 6.1},
+        "label": "0", "es": "", "vs": ["", "", "", "", "", "", ""], "vi": [0] * 8, "ktag": "",
+    }
+
+
+def make_response(songs: int) -> bytes:
+    """生成包含 songs 首歌曲的歌单响应"""
+    rng = random.Random(SEED)
+    data = {
+        "code": 0, "ts": 1700000000000, "start_ts": 1700000000000, "traceid": "0" * 16,
+        "req_0": {"code": 0, "data": {
+            "dirinfo": {"id": 1, "title": "合成歌单", "desc": "", "picurl": "", "songnum": songs},
+            "total_song_num": songs,
+            "songlist": [make_song(rng, i) for i in range(songs)],
+        }},
+    }
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+def measure(func, repeat: int) -> tuple[float, int]:
+    """返回 repeat 次运行中的最短耗时与一次运行的峰值内存(字节)"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="musicu.fcg 响应解码基准")
+    parser.add_argument("--songs", type=int, nargs="+", default=[1000, 5000], help="歌单歌曲数")
+    parser.add_argument("--repeat", type=int, default=3, help="每项重复次数, 取最短耗时")
+    args = parser.parse_args()
+
+    for songs in args.songs:
+        content = make_response(songs)
+        expected = MusicDataParser.parse_playlist(json.loads(content))
+        print(f"{songs} 首歌曲, 响应 {len(content) / 1024 / 1024:.2f} MB")
+        for backend in JSON_BACKENDS:
+            decoder = JsonDecoder(backend)
+            cases = [("完整解码", None)]
+            if backend == JsonBackend.MSGSPEC:
+                cases.append(("部分解码", PAYLOAD))
+            for label, payload in cases:
+                def run():
+                    return MusicDataParser.parse_playlist(decoder.decode(content, payload))
+
+                assert run() == expected
+                seconds, peak = measure(run, args.repeat)
+                print(f"  {backend.name:8} {label}: {seconds * 1000:8.1f} ms, 峰值内存 {peak / 1024 / 1024:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""qrc_decrypt 线性扩展回归基准
+
+用 qrc_encrypt 生成不同大小的合成 QRC 数据, 统计每 KB 的解密耗时。
+若最大输入的单位耗时超过最小输入的 SCALING_LIMIT 倍(例如又出现了按块复制剩余缓冲区的二次复杂度), 以非零状态码退出。
+
+用法(在项目根目录):
+    python -m benchmarks.bench_qrc_scaling
+"""
+import random
+import string
+import sys
+import time
+
+from decryptor import qrc_decrypt, qrc_encrypt
+
+SIZES_KB = (4, 16, 64, 256)
+SCALING_LIMIT = 2.0
+REPEAT = 3
+
+
+def make_qrc(size_kb: int, seed: int = 0) -> str:
+    """生成约 size_kb KB 密文的合成 QRC 数据(hex)"""
+    rng = random.Random(seed)
+    return qrc_encrypt("".join(rng.choice(string.ascii_letters) for _ in range(size_kb * 1400)))
+
+
+def measure(encrypted_qrc: str) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        qrc_decrypt(encrypted_qrc)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    per_kb = []
+    for size_kb in SIZES_KB:
+        encrypted_qrc = make_qrc(size_kb)
+        actual_kb = len(encrypted_qrc) / 2 / 1024
+        elapsed = measure(encrypted_qrc)
+        per_kb.append(elapsed / actual_kb)
+        print(f"{actual_kb:8.1f} KB  {elapsed * 1000:9.2f} ms  {per_kb[-1] * 1e6:9.1f} us/KB")
+
+    ratio = per_kb[-1] / per_kb[0]
+    print(f"单位耗时比(最大/最小): {ratio:.2f}")
+    if ratio > SCALING_LIMIT:
+        print(f"解密耗时未随输入线性增长(阈值 {SCALING_LIMIT})")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,53 @@
 # SPDX-FileCopyrightText: Copyright (C) 2024 沉默の金 <cmzj@cmzj.org>
 # SPDX-License-Identifier: GPL-3.0-only
-from zlib import decompress
+import codecs
+from collections.abc import Iterable, Iterator
+from zlib import compress, decompressobj, error as zlib_error
 
+from decryptor import tripledes, tripledes_table
 from decryptor.qmc1 import qmc1_decrypt
-from decryptor.tripledes import DECRYPT, tripledes_crypt, tripledes_key_setup
-from utils.menum import QrcType
+from decryptor.tripledes import DECRYPT, ENCRYPT
+from utils.menum import DesBackend, QrcType
 from utils.logger import logger
 
 QRC_KEY = b"!@#)(*$%123ZXC!@!@#)(NHL"
 KRC_KEY = b"@Gaw^2tGQ61-\xce\xd2ni"
 
+# 流式解密时每次处理的字节数, 需同时是 DES 分组(8)与 KRC 密钥长度(16)的倍数
+STREAM_CHUNK_SIZE = 64 * 1024
 
-def qrc_decrypt(encrypted_qrc: str | bytearray | bytes, qrc_type: QrcType = QrcType.CLOUD) -> str:
+DES_BACKENDS = {
+    DesBackend.REFERENCE: tripledes,
+    DesBackend.TABLE: tripledes_table,
+}
+
+try:
+    from decryptor import tripledes_numpy
+except ImportError:
+    # numpy 为可选依赖, 未安装时批量解密退回查表实现
+    pass
+else:
+    DES_BACKENDS[DesBackend.NUMPY] = tripledes_numpy
+
+
+def _inflate_text(chunks: Iterable[bytes | bytearray]) -> str:
+    """将解密后的数据块边产生边解压, 并增量解码为 UTF-8 文本"""
+    decompressor = decompressobj()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts = []
+    for chunk in chunks:
+        parts.append(decoder.decode(decompressor.decompress(chunk)))
+        if decompressor.eof:
+            break
+    parts.append(decoder.decode(decompressor.flush(), final=True))
+    if not decompressor.eof:
+        msg = "压缩数据不完整"
+        raise zlib_error(msg)
+    return "".join(parts)
+
+
+def _qrc_ciphertext(encrypted_qrc: str | bytearray | bytes, qrc_type: QrcType) -> memoryview:
+    """校验并转换加密歌词, 返回待 DES 解密的数据视图"""
     if encrypted_qrc is None or encrypted_qrc.strip() == "":
         logger.error("没有可解密的数据")
         msg = "没有可解密的数据"
@@ -28,19 +64,38 @@ def qrc_decrypt(encrypted_qrc: str | bytearray | bytes, qrc_type: QrcType = QrcT
         msg = "无效的加密数据类型"
         raise Exception(msg)
 
-    try:
-        if qrc_type == QrcType.LOCAL:
-            qmc1_decrypt(encrypted_text_byte)
-            encrypted_text_byte = encrypted_text_byte[11:]
+    encrypted_view = memoryview(encrypted_text_byte)
+    if qrc_type == QrcType.LOCAL:
+        qmc1_decrypt(encrypted_text_byte)
+        encrypted_view = encrypted_view[11:]
+    return encrypted_view
+
+
+def _qrc_blocks(des, encrypted_view: memoryview, schedule: tuple) -> Iterator[bytearray]:
+    """按 STREAM_CHUNK_SIZE 分段解密"""
+    for i in range(0, len(encrypted_view), STREAM_CHUNK_SIZE):
+        yield des.tripledes_crypt_blocks(encrypted_view[i:i + STREAM_CHUNK_SIZE], schedule)
 
-        data = bytearray()
-        schedule = tripledes_key_setup(QRC_KEY, DECRYPT)
 
-        # 以 8 字节为单位迭代 encrypted_text_byte
-        for i in range(0, len(encrypted_text_byte), 8):
-            data += tripledes_crypt(encrypted_text_byte[i:], schedule)
+def _take(chunks: Iterator[bytes | bytearray], size: int, carry: list[memoryview]) -> Iterator[memoryview]:
+    """从连续的数据块中取出接下来的 size 字节, 跨越边界的剩余部分留在 carry 中供下一段使用"""
+    while size > 0:
+        chunk = carry.pop() if carry else memoryview(next(chunks))
+        if len(chunk) > size:
+            carry.append(chunk[size:])
+            chunk = chunk[:size]
+        size -= len(chunk)
+        yield chunk
 
-        decrypted_qrc = decompress(data).decode("utf-8")
+
+def qrc_decrypt(encrypted_qrc: str | bytearray | bytes, qrc_type: QrcType = QrcType.CLOUD,
+                backend: DesBackend = DesBackend.TABLE) -> str:
+    encrypted_view = _qrc_ciphertext(encrypted_qrc, qrc_type)
+
+    try:
+        des = DES_BACKENDS[backend]
+        schedule = des.tripledes_key_setup(QRC_KEY, DECRYPT)
+        decrypted_qrc = _inflate_text(_qrc_blocks(des, encrypted_view, schedule))
     except Exception as e:
         logger.exception("解密失败")
         msg = "解密失败"
@@ -48,22 +103,81 @@ def qrc_decrypt(encrypted_qrc: str | bytearray | bytes, qrc_type: QrcType = QrcT
     return decrypted_qrc
 
 
-def krc_decrypt(encrypted_lyrics: bytearray | bytes) -> str:
-    if isinstance(encrypted_lyrics, bytes):
-        encrypted_data = bytearray(encrypted_lyrics)[4:]
-    elif isinstance(encrypted_lyrics, bytearray):
-        encrypted_data = encrypted_lyrics[4:]
+def qrc_encrypt(text: str, backend: DesBackend = DesBackend.TABLE) -> str:
+    """加密 QRC 歌词, qrc_decrypt 的逆运算
+
+    :param text: 歌词文本
+    :param backend: DES 实现
+    :return: 十六进制的加密歌词
+    """
+    data = bytearray(compress(text.encode("utf-8")))
+    data += bytes(-len(data) % 8)  # 补齐到 8 字节, 解压时会忽略末尾多余的数据
+
+    des = DES_BACKENDS[backend]
+    schedule = des.tripledes_key_setup(QRC_KEY, ENCRYPT)
+    return des.tripledes_crypt_blocks(data, schedule).hex().upper()
+
+
+def qrc_decrypt_many(encrypted_qrcs: list[str | bytearray | bytes], qrc_type: QrcType = QrcType.CLOUD,
+                     backend: DesBackend | None = None) -> list[str]:
+    """批量解密 QRC 歌词
+
+    所有歌词的分组拼接后按 STREAM_CHUNK_SIZE 分段解密, 安装了 numpy 时默认使用向量化实现;
+    每段解密结果按歌词边界切分后直接送入各自的流式解压, 不保留完整的明文。
+
+    :param encrypted_qrcs: 加密歌词列表
+    :param qrc_type: 歌词类型
+    :param backend: DES 实现, 为 None 时自动选择
+    :return: 与输入顺序一致的解密结果
+    """
+    if backend is None:
+        backend = DesBackend.NUMPY if DesBackend.NUMPY in DES_BACKENDS else DesBackend.TABLE
+
+    views = [_qrc_ciphertext(encrypted_qrc, qrc_type) for encrypted_qrc in encrypted_qrcs]
+
+    try:
+        if any(len(view) % 8 for view in views):
+            msg = "数据长度必须是 8 的倍数"
+            raise ValueError(msg)
+
+        des = DES_BACKENDS[backend]
+        schedule = des.tripledes_key_setup(QRC_KEY, DECRYPT)
+        blocks = _qrc_blocks(des, memoryview(b"".join(views)), schedule)
+
+        decrypted_qrcs = []
+        carry = []
+        for view in views:
+            segment = _take(blocks, len(view), carry)
+            decrypted_qrcs.append(_inflate_text(segment))
+            # 跳过压缩数据之后的填充, 使下一首歌词从自己的起始位置开始
+            for _ in segment:
+                pass
+    except Exception as e:
+        logger.exception("解密失败")
+        msg = "解密失败"
+        raise Exception(msg) from e
+    return decrypted_qrcs
+
+
+def _krc_blocks(encrypted_data: memoryview) -> Iterator[bytes]:
+    """按 STREAM_CHUNK_SIZE 分段解密, 密钥循环平铺到分段长度后整段异或"""
+    key = int.from_bytes(KRC_KEY * (STREAM_CHUNK_SIZE // len(KRC_KEY)), "little")
+    for i in range(0, len(encrypted_data), STREAM_CHUNK_SIZE):
+        chunk = encrypted_data[i:i + STREAM_CHUNK_SIZE]
+        size = len(chunk)
+        yield (int.from_bytes(chunk, "little") ^ (key & ((1 << (8 * size)) - 1))).to_bytes(size, "little")
+
+
+def krc_decrypt(encrypted_lyrics: bytearray | bytes | memoryview) -> str:
+    if isinstance(encrypted_lyrics, (bytes, bytearray, memoryview)):
+        encrypted_data = memoryview(encrypted_lyrics)[4:]
     else:
         logger.error("无效的加密数据类型")
         msg = "无效的加密数据类型"
         raise Exception(msg)
 
     try:
-        decrypted_data = bytearray()
-        for i, item in enumerate(encrypted_data):
-            decrypted_data.append(item ^ KRC_KEY[i % len(KRC_KEY)])
-
-        return decompress(decrypted_data).decode('utf-8')
+        return _inflate_text(_krc_blocks(encrypted_data))
     except Exception as e:
         logger.exception("解密失败")
         msg = "解密失败"
@@ -5,9 +5,20 @@ import binascii
 import hashlib
 import json
 from base64 import b64decode, b64encode
+from functools import lru_cache
 
 from pyaes import AESModeOfOperationECB
 
+from utils.menum import AesBackend
+
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:
+    # cryptography 为可选依赖, 未安装时使用纯 Python 的 pyaes
+    Cipher = None
+
+AES_BACKENDS = [AesBackend.PYAES] if Cipher is None else [AesBackend.CRYPTOGRAPHY, AesBackend.PYAES]
+
 
 def pkcs7_pad(data: bytes, block_size: int = 16) -> bytes:
     pad_len = block_size - (len(data) % block_size)
@@ -23,23 +34,52 @@ def pkcs7_unpad(data: bytes) -> bytes:
     return data[:-pad_len]
 
 
-def aes_encrypt(data: str | bytes, key: bytes) -> bytes:
+@lru_cache(maxsize=16)
+def _pyaes_cipher(key: bytes) -> AESModeOfOperationECB:
+    return AESModeOfOperationECB(key)
+
+
+@lru_cache(maxsize=16)
+def _cryptography_cipher(key: bytes) -> "Cipher":
+    return Cipher(algorithms.AES(key), modes.ECB())  # noqa: S305
+
+
+def _aes_ecb(data: bytes, key: bytes, encrypt: bool, backend: AesBackend | None) -> bytes | bytearray:
+    """AES-ECB 加解密, 同一密钥的 cipher 对象会被复用
+
+    :param data: 长度为 16 的倍数的数据
+    :param key: 密钥
+    :param encrypt: True 为加密, False 为解密
+    :param backend: AES 实现, 为 None 时使用可用的最快实现
+    :return: 处理后的数据
+    """
+    if backend is None:
+        backend = AES_BACKENDS[0]
+
+    if backend == AesBackend.CRYPTOGRAPHY:
+        cipher = _cryptography_cipher(key)
+        context = cipher.encryptor() if encrypt else cipher.decryptor()
+        return context.update(data) + context.finalize()
+
+    aes = _pyaes_cipher(key)
+    crypt = aes.encrypt if encrypt else aes.decrypt
+    view = memoryview(data)
+    output = bytearray(len(view))
+    for i in range(0, len(view), 16):
+        output[i:i + 16] = crypt(bytes(view[i:i + 16]))
+    return output
+
+
+def aes_encrypt(data: str | bytes, key: bytes, backend: AesBackend | None = None) -> bytes:
     if isinstance(data, str):
         data = data.encode()
     padded_data = pkcs7_pad(data)  # Ensure the data is padded
-    aes = AESModeOfOperationECB(key)  # Using ECB mode
-    encrypted_data = b''
-    for i in range(0, len(padded_data), 16):
-        encrypted_data += aes.encrypt(padded_data[i:i + 16])  # Encrypt in 16-byte blocks
-    return encrypted_data
+    return bytes(_aes_ecb(padded_data, key, True, backend))  # Using ECB mode
 
 
-def aes_decrypt(cipher_buffer: bytes, key: bytes) -> bytes:
-    aes = AESModeOfOperationECB(key)  # Using ECB mode
-    decrypted_data = b''
-    for i in range(0, len(cipher_buffer), 16):
-        decrypted_data += aes.decrypt(cipher_buffer[i:i + 16])  # Decrypt in 16-byte blocks
-    return pkcs7_unpad(decrypted_data)  # Remove padding after decryption
+def aes_decrypt(cipher_buffer: bytes, key: bytes, backend: AesBackend | None = None) -> bytes:
+    decrypted_data = _aes_ecb(cipher_buffer, key, False, backend)  # Using ECB mode
+    return bytes(pkcs7_unpad(decrypted_data))  # Remove padding after decryption
 
 
 def eapi_params_encrypt(path: bytes, params: dict) -> str:
@@ -83,5 +123,5 @@ def cache_key_decrypt(data: str | bytes) -> str:
     return aes_decrypt(b64decode(data), b")(13daqP@ssw0rd~").decode()
 
 
-def eapi_response_decrypt(cipher_buffer: bytes) -> bytes:
-    return aes_decrypt(cipher_buffer, b'e82ckenh8dichen8')
+def eapi_response_decrypt(cipher_buffer: bytes, backend: AesBackend | None = None) -> bytes:
+    return aes_decrypt(cipher_buffer, b'e82ckenh8dichen8', backend)
@@ -3,6 +3,11 @@
 
 # SPDX-FileCopyrightText: Copyright (C) 2024 沉默の金 <cmzj@cmzj.org>
 # SPDX-License-Identifier: GPL-3.0-only
+try:
+    import numpy as np
+except ImportError:
+    # numpy 为可选依赖, 未安装时使用大整数异或
+    np = None
 
 PRIVKEY = (
     0xc3, 0x4a, 0xd6, 0xca, 0x90, 0x67, 0xf7, 0x52,
@@ -31,6 +36,37 @@ PRIVKEY = (
 )
 
 
-def qmc1_decrypt(data: bytearray) -> None:
-    for i, _value in enumerate(data):
-        data[i] ^= PRIVKEY[(i % 0x7FFF) & 0x7F] if i > 0x7FFF else PRIVKEY[i & 0x7F]
+# 密钥流: 前 0x8000 字节为 PRIVKEY[i & 0x7F], 之后以 0x7FFF 为周期取 PRIVKEY[(i % 0x7FFF) & 0x7F]
+KEYSTREAM_HEAD = bytes(PRIVKEY[i & 0x7F] for i in range(0x8000))
+KEYSTREAM_CYCLE = bytes(PRIVKEY[i & 0x7F] for i in range(0x7FFF))
+
+
+def qmc1_keystream(offset: int, length: int) -> bytes:
+    """生成从 offset 开始、长度为 length 的密钥流
+
+    :param offset: 在整个文件中的起始位置
+    :param length: 长度
+    :return: 密钥流
+    """
+    head = KEYSTREAM_HEAD[offset:offset + length]
+    remaining = length - len(head)
+    if remaining <= 0:
+        return head
+
+    start = max(offset, 0x8000) % 0x7FFF
+    repeat = (start + remaining) // 0x7FFF + 1
+    return head + (KEYSTREAM_CYCLE * repeat)[start:start + remaining]
+
+
+def qmc1_decrypt(data: bytearray, offset: int = 0) -> None:
+    """原地解密 QMC1 数据
+
+    :param data: 待解密的数据, 解密结果直接写回
+    :param offset: data 在整个文件中的起始位置, 分块解密时使用
+    """
+    keystream = qmc1_keystream(offset, len(data))
+    if np is not None:
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        np.bitwise_xor(buffer, np.frombuffer(keystream, dtype=np.uint8), out=buffer)
+    else:
+        data[:] = (int.from_bytes(data, "little") ^ int.from_bytes(keystream, "little")).to_bytes(len(data), "little")
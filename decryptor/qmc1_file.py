@@ -0,0 +1,80 @@
+# 分块解密本地 QMC1 加密音频(.qmc0/.qmc3/.qmcflac 等), 内存占用与文件大小无关
+
+# SPDX-FileCopyrightText: Copyright (C) 2024 沉默の金 <cmzj@cmzj.org>
+# SPDX-License-Identifier: GPL-3.0-only
+import argparse
+import mmap
+import os
+import sys
+from pathlib import Path
+
+from decryptor.qmc1 import qmc1_decrypt
+
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# 加密文件扩展名 -> 解密后的扩展名
+QMC1_SUFFIXES = {
+    ".qmc0": ".mp3",
+    ".qmc3": ".mp3",
+    ".qmcogg": ".ogg",
+    ".qmcflac": ".flac",
+}
+
+
+def qmc1_decrypt_file(input_path: str | Path, output_path: str | Path | None = None,
+                      chunk_size: int = CHUNK_SIZE) -> Path:
+    """分块解密 QMC1 加密音频文件
+
+    :param input_path: 加密文件路径
+    :param output_path: 输出路径, 默认与输入同名并替换扩展名
+    :param chunk_size: 每次解密的字节数
+    :return: 输出文件路径
+    """
+    input_path = Path(input_path)
+    if output_path is None:
+        suffix = QMC1_SUFFIXES.get(input_path.suffix.lower())
+        if suffix is None:
+            msg = f"不支持的文件类型: {input_path.suffix}"
+            raise ValueError(msg)
+        output_path = input_path.with_suffix(suffix)
+    output_path = Path(output_path)
+
+    with open(input_path, "rb") as src, open(output_path, "wb") as dst:
+        size = os.fstat(src.fileno()).st_size
+        if size == 0:
+            return output_path
+
+        with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as encrypted:
+            # 密钥流按文件内偏移计算, 跨块边界保持连续
+            for offset in range(0, size, chunk_size):
+                chunk = bytearray(encrypted[offset:offset + chunk_size])
+                qmc1_decrypt(chunk, offset)
+                dst.write(chunk)
+
+    return output_path
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="解密 QMC1 加密的音频文件(.qmc0/.qmc3/.qmcflac 等)")
+    parser.add_argument("files", nargs="+", type=Path, help="加密文件路径")
+    parser.add_argument("-o", "--output-dir", type=Path, help="输出目录, 默认与输入文件相同")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="每次解密的字节数")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for file in args.files:
+        output_path = None
+        if args.output_dir and file.suffix.lower() in QMC1_SUFFIXES:
+            args.output_dir.mkdir(parents=True, exist_ok=True)
+            output_path = args.output_dir / file.with_suffix(QMC1_SUFFIXES[file.suffix.lower()]).name
+        try:
+            result = qmc1_decrypt_file(file, output_path, args.chunk_size)
+            print(f"解密完成: {file} -> {result}")
+        except Exception as e:
+            print(f"解密失败: {file}: {str(e)}")
+            failed += 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
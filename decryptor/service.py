@@ -0,0 +1,47 @@
+# SPDX-FileCopyrightText: Copyright (C) 2024 沉默の金 <cmzj@cmzj.org>
+# SPDX-License-Identifier: GPL-3.0-only
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+from decryptor import qrc_decrypt, qrc_decrypt_many
+from utils.config import config
+from utils.menum import QrcType
+
+
+class DecryptService:
+    """歌词解密服务
+
+    DES 解密与 zlib 解压是纯 CPU 运算, 放到执行器中运行, 避免阻塞机器人与下载共用的事件循环。
+    max_workers 大于 0 时使用进程池, 否则使用事件循环默认的线程池。
+    """
+
+    def __init__(self, max_workers: int = 0):
+        self.max_workers = max_workers
+        self._executor = None
+
+    def _ensure_executor(self) -> ProcessPoolExecutor | None:
+        """确保进程池存在"""
+        if self._executor is None and self.max_workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def qrc_decrypt(self, encrypted_qrc: str | bytearray | bytes, qrc_type: QrcType = QrcType.CLOUD) -> str:
+        """异步解密单个 QRC 歌词"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._ensure_executor(), qrc_decrypt, encrypted_qrc, qrc_type)
+
+    async def qrc_decrypt_many(self, encrypted_qrcs: list[str | bytearray | bytes],
+                               qrc_type: QrcType = QrcType.CLOUD) -> list[str]:
+        """异步批量解密 QRC 歌词, 整批只提交一次任务"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._ensure_executor(), qrc_decrypt_many, encrypted_qrcs, qrc_type)
+
+    def shutdown(self):
+        """关闭进程池"""
+        if self._executor:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+
+# 全局解密服务实例
+decrypt_service = DecryptService(config.DECRYPT_WORKERS)
@@ -4,7 +4,7 @@
 
 # SPDX-FileCopyrightText: Copyright (C) 2024 沉默の金 <cmzj@cmzj.org>
 # SPDX-License-Identifier: GPL-3.0-only
-# from LDDC.utils.cache import cache
+from functools import lru_cache
 
 ENCRYPT = 1
 DECRYPT = 0
@@ -157,7 +157,7 @@ def inverse_permutation(s0: int, s1: int) -> bytearray:
     return data
 
 
-def f(state: int, key: list[int]) -> int:
+def f(state: int, key: tuple[int, ...]) -> int:
     # 提取位并左移
     t1 = (bitnum_intl(state, 31, 0) | ((state & 0xf0000000) >> 1) | bitnum_intl(state, 4, 5) |
           bitnum_intl(state, 3, 6) | ((state & 0x0f000000) >> 3) | bitnum_intl(state, 8, 11) |
@@ -202,7 +202,7 @@ def f(state: int, key: list[int]) -> int:
             bitnum_intl(state, 3, 30) | bitnum_intl(state, 24, 31))
 
 
-def crypt(input_data: bytearray, key: list) -> bytearray:
+def crypt(input_data: bytearray, key: tuple) -> bytearray:
     s0, s1 = initial_permutation(input_data)  # 初始置换
 
     for idx in range(15):  # 15轮迭代
@@ -214,7 +214,7 @@ def crypt(input_data: bytearray, key: list) -> bytearray:
     return inverse_permutation(s0, s1)  # 逆置换
 
 
-def key_schedule(key: bytes, mode: int) -> list[list[int]]:
+def key_schedule(key: bytes, mode: int) -> tuple[tuple[int, ...], ...]:
     schedule = [[0] * 6 for _ in range(16)]
     key_rnd_shift = (1, 1, 2, 2, 2, 2, 2, 2, 1, 2, 2, 2, 2, 2, 2, 1)
     key_perm_c = (56, 48, 40, 32, 24, 16, 8, 0, 57, 49, 41, 33, 25, 17, 9, 1, 58, 50, 42, 34, 26, 18, 10, 2, 59, 51, 43, 35)
@@ -240,21 +240,49 @@ def key_schedule(key: bytes, mode: int) -> list[list[int]]:
         for j in range(24, 48):
             schedule[togen][j // 8] |= bitnum_intr(d, key_compression[j] - 27, 7 - (j % 8))
 
-    return schedule
+    return tuple(tuple(round_key) for round_key in schedule)
 
 
-# @cache.memoize()
-def tripledes_key_setup(key: bytes, mode: int) -> list[list[list[int]]]:
+def tripledes_key_setup(key: bytes | bytearray, mode: int) -> tuple[tuple[tuple[int, ...], ...], ...]:
+    """生成 Triple-DES 密钥编排, 按 (key, mode) 缓存, 每个进程只计算一次。
+
+    :param key: 24 字节密钥
+    :param mode: ENCRYPT 或 DECRYPT
+    :return: 3 组 × 16 轮 × 6 字节的轮密钥(只读元组)
+    """
+    return _tripledes_key_setup(bytes(key), mode)
+
+
+@lru_cache(maxsize=16)
+def _tripledes_key_setup(key: bytes, mode: int) -> tuple[tuple[tuple[int, ...], ...], ...]:
     if mode == ENCRYPT:
-        return [key_schedule(key[0:], ENCRYPT),
+        return (key_schedule(key[0:], ENCRYPT),
                 key_schedule(key[8:], DECRYPT),
-                key_schedule(key[16:], ENCRYPT)]
-    return [key_schedule(key[16:], DECRYPT),
+                key_schedule(key[16:], ENCRYPT))
+    return (key_schedule(key[16:], DECRYPT),
             key_schedule(key[8:], ENCRYPT),
-            key_schedule(key[0:], DECRYPT)]
+            key_schedule(key[0:], DECRYPT))
 
 
-def tripledes_crypt(data: bytearray, key: list) -> bytearray:
+def tripledes_crypt(data: bytearray, key: tuple) -> bytearray:
     for i in range(3):
         data = crypt(data, key[i])
     return data
+
+
+def tripledes_crypt_blocks(data: bytearray | bytes | memoryview, key: tuple) -> bytearray:
+    """以 ECB 方式逐块处理整段数据, 不复制输入。
+
+    :param data: 长度为 8 的倍数的数据
+    :param key: tripledes_key_setup 返回的密钥编排
+    :return: 处理后的数据
+    """
+    view = memoryview(data)
+    if len(view) % 8:
+        msg = "数据长度必须是 8 的倍数"
+        raise ValueError(msg)
+
+    output = bytearray(len(view))
+    for i in range(0, len(view), 8):
+        output[i:i + 8] = tripledes_crypt(view[i:i + 8], key)
+    return output
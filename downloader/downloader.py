@@ -18,7 +18,7 @@ class DownloadManager:
     async def download_with_progress(self, url: str, filepath: Path) -> bool:
         """带进度和速度显示的下载函数"""
         try:
-            client = await network._ensure_async_client()
+            client = await network._ensure_async_client(url)
             async with client.stream('GET', url) as response:
                 if response.status_code != 200:
                     self.log(f"下载失败: HTTP状态码 {response.status_code}")
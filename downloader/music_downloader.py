@@ -25,7 +25,8 @@ class MusicDownloader:
         self.download_manager = DownloadManager()
         self.log = logger.log_progress
 
-    async def download_song(self, song_info: Dict, download_dir: Path, filetype: str = 'm4a', cookie: str = None) -> Optional[Path]:
+    async def download_song(self, song_info: Dict, download_dir: Path, filetype: str = 'm4a', cookie: str = None,
+                            song_url: str = None) -> Optional[Path]:
         """下载歌曲并处理封面、歌词等
 
         Args:
@@ -33,6 +34,7 @@ class MusicDownloader:
             download_dir: 下载目录
             filetype: 文件类型 ('m4a'/'128'/'320'/'flac/ATMOS_51/ATMOS_2/MASTER')
             cookie: QQ音乐Cookie
+            song_url: 已获取的下载链接（如批量获取的结果），为空时单独获取
 
         Returns:
             处理完成的文件路径，失败则返回None
@@ -43,20 +45,21 @@ class MusicDownloader:
 
         try:
             # 1. 获取歌曲URL
-            self.log("正在获取下载链接...")
-            song_url_result = await self.qq_music_api.get_song_url(song_info['mid'], filetype=filetype, cookie=cookie)
-            if song_url_result['code'] == -1 or not song_url_result.get('url'):
-                error_msg = "无法获取歌曲下载链接，可能原因："
-                if not cookie:
-                    error_msg += "\n- 未提供QQ音乐Cookie（部分歌曲需要登录）"
-                if filetype in ["320", "flac", "ATMOS_51", "ATMOS_2", "MASTER"]:
-                    error_msg += f"\n- 当前音质（{filetype}）可能需要VIP权限"
-                error_msg += "\n- 歌曲可能有版权限制"
-                self.log(error_msg)
-                return None
+            if not song_url:
+                self.log("正在获取下载链接...")
+                song_url_result = await self.qq_music_api.get_song_url(song_info['mid'], filetype=filetype, cookie=cookie)
+                if song_url_result['code'] == -1 or not song_url_result.get('url'):
+                    error_msg = "无法获取歌曲下载链接，可能原因："
+                    if not cookie:
+                        error_msg += "\n- 未提供QQ音乐Cookie（部分歌曲需要登录）"
+                    if filetype in ["320", "flac", "ATMOS_51", "ATMOS_2", "MASTER"]:
+                        error_msg += f"\n- 当前音质（{filetype}）可能需要VIP权限"
+                    error_msg += "\n- 歌曲可能有版权限制"
+                    self.log(error_msg)
+                    return None
+                song_url = song_url_result["url"]
 
             # 2. 下载歌曲
-            song_url = song_url_result["url"]
             temp_filepath = await get_file_path(song_info, song_url, download_dir)
             self.log(f"准备下载歌曲到: {temp_filepath.name}")
 
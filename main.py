@@ -1,9 +1,17 @@
+import multiprocessing
 import sys
 from PyQt6.QtWidgets import QApplication
+from decryptor.service import decrypt_service
 from ui.mainui import QQMusicDownloaderGUI
+from utils.loop_thread import background_loop
 
 if __name__ == "__main__":
+    # 打包后的程序在 decryptor.workers 大于0时会启动解密子进程, 子进程需要由此进入
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
+    # 退出时关闭共享的 HTTP 客户端与后台事件循环, 再关闭解密进程池
+    app.aboutToQuit.connect(background_loop.stop)
+    app.aboutToQuit.connect(decrypt_service.shutdown)
     window = QQMusicDownloaderGUI()
     window.show()
     sys.exit(app.exec())
@@ -12,6 +12,8 @@ project_root = current_dir.parent
 sys.path.insert(0, str(project_root))
 
 from utils.config import config
+from utils.http_client import http_clients
+from decryptor.service import decrypt_service
 
 
 
@@ -21,6 +23,7 @@ class QQMusicBot:
         self.app = (ApplicationBuilder()
                     .token(config.BOT_TOKEN)
                     .base_url(config.API_BASE_URL)  # 使用配置中的自定义API地址
+                    .post_shutdown(self._post_shutdown)
                     .build())
 
         # 注册所有命令和回调
@@ -45,6 +48,12 @@ class QQMusicBot:
                 if hasattr(module, "register"):
                     module.register(self.app)
 
+    @staticmethod
+    async def _post_shutdown(application: Application):
+        # 关闭共享的 HTTP 客户端与解密进程池
+        await http_clients.aclose()
+        decrypt_service.shutdown()
+
     def run(self):
         print("QQ音乐Telegram机器人启动中...")
         self.app.run_polling()
@@ -14,6 +14,7 @@ from PyQt6.QtWidgets import (QComboBox, QFileDialog, QGridLayout,
 
 from api.qm import QQMusicAPI
 from downloader.music_downloader import MusicDownloader
+from utils.loop_thread import background_loop
 from utils.menum import SearchType
 
 
@@ -96,10 +97,17 @@ class WorkerThread(QThread):
                 download_dir = self.params.get("download_dir")
                 cookie = self.params.get("cookie", "")
                 total = len(songs)
+                batch_size = self.downloader.qq_music_api.vkey_batch_size
+                song_urls = {}
 
                 for i, song_info in enumerate(songs):
                     self.progress_signal.emit(i, total)
-                    result = await self.downloader.download_song(song_info, download_dir, filetype, cookie)
+                    # 按批解析下载链接，链接有有效期，不一次性解析整个列表
+                    if i % batch_size == 0:
+                        song_urls = await self.downloader.qq_music_api.get_song_urls(
+                            [song['mid'] for song in songs[i:i + batch_size]], filetype, cookie)
+                    result = await self.downloader.download_song(song_info, download_dir, filetype, cookie,
+                                                                 song_urls.get(song_info['mid']))
                     self.update_signal.emit({
                         "type": "download_progress",
                         "data": {
@@ -306,17 +314,13 @@ class WorkerThread(QThread):
 
     def run(self):
         print(f"Starting new thread for task: {self.task_type}")
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        # 任务在常驻的后台事件循环中运行，HTTP 连接在任务之间复用，本线程只等待任务完成
         try:
-            loop.run_until_complete(self.run_task())
+            background_loop.submit(self.run_task()).result()
         except Exception as e:
             print(f"Error in thread: {e}")
             import traceback
             traceback.print_exc()
-        finally:
-            # 不要关闭事件循环，仅清理它
-            loop.run_until_complete(loop.shutdown_asyncgens())
         print(f"Thread completed for task: {self.task_type}")
 
 
@@ -726,6 +730,11 @@ class QQMusicDownloaderGUI(QMainWindow):
 
         update_data = data["data"]
 
+        # 搜索、专辑与歌单接口失败（如模块被限流）时解析结果不包含列表，提示错误而不是显示结果
+        if update_type in ("search_result", "album_songs", "playlist_songs") and update_data.get("code") == -1:
+            self.handle_worker_error(update_data.get("error", "获取数据失败"))
+            return
+
         if update_type == "search_result":
             self.display_search_results(update_data)
 
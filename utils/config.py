@@ -66,6 +66,30 @@ class Config:
     QQMUSIC_COOKIE: str = field(init=False)
     BOT_TOKEN: str = field(init=False)
     API_BASE_URL: str = field(init=False)
+    DECRYPT_WORKERS: int = field(init=False)
+    LYRICS_CACHE_ENABLED: bool = field(init=False)
+    LYRICS_CACHE_PATH: str = field(init=False)
+    LYRICS_CACHE_TTL: float = field(init=False)
+    LYRICS_CACHE_MAX_ENTRIES: int = field(init=False)
+    API_BATCH_WINDOW: float = field(init=False)
+    API_BATCH_SIZE: int = field(init=False)
+    URL_CACHE_MAX_ENTRIES: int = field(init=False)
+    URL_CACHE_TTL: float = field(init=False)
+    URL_CACHE_MARGIN: float = field(init=False)
+    URL_CACHE_NEGATIVE_TTL: float = field(init=False)
+    SEARCH_CACHE_MAX_ENTRIES: int = field(init=False)
+    SEARCH_CACHE_TTL: float = field(init=False)
+    API_RATE_LIMIT: float = field(init=False)
+    API_RATE_BURST: int = field(init=False)
+    API_CONCURRENCY_INITIAL: int = field(init=False)
+    API_CONCURRENCY_MIN: int = field(init=False)
+    API_CONCURRENCY_MAX: int = field(init=False)
+    API_LATENCY_THRESHOLD: float = field(init=False)
+    HTTP_MAX_CONNECTIONS: int = field(init=False)
+    HTTP_MAX_KEEPALIVE: int = field(init=False)
+    HTTP2_ENABLED: bool = field(init=False)
+    HTTP_TIMEOUT: float = field(init=False)
+    API_JSON_BACKEND: str = field(init=False)
     # 用户会话状态存储
     user_sessions = {}
 
@@ -82,6 +106,38 @@ class Config:
             "tgbot.apiBaseUrl", "https://tgbot.790366.xyz/bot")
         # 设置默认音质
         self.DEFAULT_QUALITY = self.config_file.get("quality", "flac")
+        # 歌词解密进程数，0 表示不使用进程池
+        self.DECRYPT_WORKERS = self.config_file.get("decryptor.workers", 0)
+        # 歌词缓存，默认保存30天、最多10000条
+        self.LYRICS_CACHE_ENABLED = self.config_file.get("cache.lyrics.enabled", True)
+        self.LYRICS_CACHE_PATH = self.config_file.get("cache.lyrics.path", "cache/lyrics.db")
+        self.LYRICS_CACHE_TTL = self.config_file.get("cache.lyrics.ttl", 30 * 24 * 3600)
+        self.LYRICS_CACHE_MAX_ENTRIES = self.config_file.get("cache.lyrics.maxEntries", 10000)
+        # musicu.fcg 请求合并窗口（秒）与单次最多合并的请求数，窗口为0表示不合并
+        self.API_BATCH_WINDOW = self.config_file.get("api.batchWindow", 0.01)
+        self.API_BATCH_SIZE = self.config_file.get("api.batchSize", 20)
+        # 歌曲下载链接缓存：有效期不超过 vkey 的有效期并提前 margin 秒失效，未获取到链接的结果缓存 negativeTtl 秒
+        self.URL_CACHE_MAX_ENTRIES = self.config_file.get("cache.songUrl.maxEntries", 2000)
+        self.URL_CACHE_TTL = self.config_file.get("cache.songUrl.ttl", 3600)
+        self.URL_CACHE_MARGIN = self.config_file.get("cache.songUrl.margin", 60)
+        self.URL_CACHE_NEGATIVE_TTL = self.config_file.get("cache.songUrl.negativeTtl", 300)
+        # 搜索结果缓存，默认保存10分钟、最多500条，条目数为0表示不缓存
+        self.SEARCH_CACHE_MAX_ENTRIES = self.config_file.get("cache.search.maxEntries", 500)
+        self.SEARCH_CACHE_TTL = self.config_file.get("cache.search.ttl", 600)
+        # 客户端限流：每秒请求数（0表示不限制）、突发请求数，以及自适应并发窗口的初始值、上下限与慢请求阈值（秒）
+        self.API_RATE_LIMIT = self.config_file.get("api.rateLimit.rate", 10)
+        self.API_RATE_BURST = self.config_file.get("api.rateLimit.burst", 20)
+        self.API_CONCURRENCY_INITIAL = self.config_file.get("api.rateLimit.initialConcurrency", 8)
+        self.API_CONCURRENCY_MIN = self.config_file.get("api.rateLimit.minConcurrency", 1)
+        self.API_CONCURRENCY_MAX = self.config_file.get("api.rateLimit.maxConcurrency", 32)
+        self.API_LATENCY_THRESHOLD = self.config_file.get("api.rateLimit.latencyThreshold", 3.0)
+        # 共享 HTTP 客户端：每个主机的最大连接数与空闲连接数、是否启用 HTTP/2、超时（秒）
+        self.HTTP_MAX_CONNECTIONS = self.config_file.get("http.maxConnectionsPerHost", 50)
+        self.HTTP_MAX_KEEPALIVE = self.config_file.get("http.maxKeepalivePerHost", 20)
+        self.HTTP2_ENABLED = self.config_file.get("http.http2", True)
+        self.HTTP_TIMEOUT = self.config_file.get("http.timeout", 10.0)
+        # 接口响应 JSON 解码实现：auto/stdlib/orjson/msgspec，auto 使用已安装的最快实现
+        self.API_JSON_BACKEND = self.config_file.get("api.jsonBackend", "auto")
 
 
 config = Config()
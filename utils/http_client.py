@@ -0,0 +1,75 @@
+import asyncio
+import importlib.util
+import threading
+import weakref
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from utils.config import config
+
+# HTTP/2 需要安装 h2（pip install httpx[http2]），未安装时使用 HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class HttpClientRegistry:
+    """进程级 HTTP 客户端注册表
+
+    按主机复用 httpx.AsyncClient，QQMusicAPI、NetworkManager 与机器人各模块访问同一主机时共享连接池、
+    keep-alive 连接与 TLS 会话，每个主机的连接数单独限制；启用 HTTP/2 时同一主机的并发请求复用一条连接。
+    httpx 的异步连接只能在创建它的事件循环中使用，因此客户端按事件循环分别保存，事件循环被回收后随之释放。
+    """
+
+    def __init__(self, max_connections: int = 50, max_keepalive_connections: int = 20, http2: bool = True,
+                 timeout: float = 10.0):
+        """初始化客户端注册表
+
+        Args:
+            max_connections: 每个主机的最大连接数
+            max_keepalive_connections: 每个主机保持的空闲连接数
+            http2: 是否启用 HTTP/2（需要安装 h2）
+            timeout: 请求超时（秒）
+        """
+        self.limits = httpx.Limits(max_connections=max_connections,
+                                   max_keepalive_connections=max_keepalive_connections)
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.timeout = httpx.Timeout(timeout)
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, httpx.AsyncClient]] = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self, url: str, verify: bool = True, trust_env: bool = True) -> httpx.AsyncClient:
+        """获取访问指定地址的客户端
+
+        Args:
+            url: 请求地址，按其协议与主机选择客户端
+            verify: 是否校验证书
+            trust_env: 是否读取环境变量中的代理等设置
+
+        Returns:
+            httpx.AsyncClient: 当前事件循环中该主机的客户端
+        """
+        loop = asyncio.get_running_loop()
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc.lower(), verify, trust_env)
+        with self._lock:
+            clients = self._clients.get(loop)
+            if clients is None:
+                clients = self._clients[loop] = {}
+            client = clients.get(key)
+            if client is None or client.is_closed:
+                client = clients[key] = httpx.AsyncClient(limits=self.limits, http2=self.http2, verify=verify,
+                                                          trust_env=trust_env, timeout=self.timeout)
+        return client
+
+    async def aclose(self):
+        """关闭当前事件循环中的所有客户端"""
+        with self._lock:
+            clients = self._clients.pop(asyncio.get_running_loop(), {})
+        await asyncio.gather(*(client.aclose() for client in clients.values()), return_exceptions=True)
+
+
+# 全局 HTTP 客户端注册表
+http_clients = HttpClientRegistry(config.HTTP_MAX_CONNECTIONS, config.HTTP_MAX_KEEPALIVE,
+                                  config.HTTP2_ENABLED, config.HTTP_TIMEOUT)
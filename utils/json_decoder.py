@@ -0,0 +1,185 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple, TypedDict
+
+from utils.logger import logger
+from utils.menum import JsonBackend
+
+try:
+    import orjson
+except ImportError:
+    # orjson 为可选依赖
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    # msgspec 为可选依赖, 未安装时不做按字段结构的解码
+    msgspec = None
+
+JSON_BACKENDS: Dict[JsonBackend, Callable[[bytes], Any]] = {JsonBackend.STDLIB: json.loads}
+if orjson is not None:
+    JSON_BACKENDS[JsonBackend.ORJSON] = orjson.loads
+if msgspec is not None:
+    JSON_BACKENDS[JsonBackend.MSGSPEC] = msgspec.json.Decoder().decode
+
+
+# 以下结构只声明 MusicDataParser 会读取的字段, msgspec 解码时跳过其余字段, 不为它们创建对象。
+# 叶子字段类型均为 Any, 不做类型校验; 结构与声明不符时回退为完整解码。
+class _SingerSchema(TypedDict, total=False):
+    id: Any
+    mid: Any
+    name: Any
+
+
+class _AlbumSchema(TypedDict, total=False):
+    id: Any
+    mid: Any
+    name: Any
+
+
+class _SongSchema(TypedDict, total=False):
+    id: Any
+    mid: Any
+    name: Any
+    singer: List[_SingerSchema]
+    album: _AlbumSchema
+    interval: Any
+
+
+class _SongListSchema(TypedDict, total=False):
+    list: List[_SongSchema]
+
+
+class _SearchBodySchema(TypedDict, total=False):
+    song: _SongListSchema
+    album: Any
+    songlist: Any
+
+
+class _SearchDataSchema(TypedDict, total=False):
+    body: _SearchBodySchema
+
+
+class _AlbumSongSchema(TypedDict, total=False):
+    songInfo: _SongSchema
+
+
+class _AlbumDataSchema(TypedDict, total=False):
+    albumMid: Any
+    totalNum: Any
+    songList: List[_AlbumSongSchema]
+
+
+class _DirInfoSchema(TypedDict, total=False):
+    id: Any
+    title: Any
+    desc: Any
+    picurl: Any
+
+
+class _PlaylistDataSchema(TypedDict, total=False):
+    dirinfo: _DirInfoSchema
+    total_song_num: Any
+    songlist: List[_SongSchema]
+
+
+class _SearchModuleSchema(TypedDict, total=False):
+    code: Any
+    data: _SearchDataSchema
+
+
+class _AlbumModuleSchema(TypedDict, total=False):
+    code: Any
+    data: _AlbumDataSchema
+
+
+class _PlaylistModuleSchema(TypedDict, total=False):
+    code: Any
+    data: _PlaylistDataSchema
+
+
+# (module, method) 到响应结构的映射, 未列出的模块完整解码
+MODULE_SCHEMAS: Dict[Tuple[str, str], type] = {
+    ("music.search.SearchCgiService", "DoSearchForQQMusicDesktop"): _SearchModuleSchema,
+    ("music.musichallAlbum.AlbumSongList", "GetAlbumSongList"): _AlbumModuleSchema,
+    ("music.srfDissInfo.aiDissInfo", "uniform_get_Dissinfo"): _PlaylistModuleSchema,
+}
+
+
+def default_backend() -> JsonBackend:
+    """返回可用的最快实现"""
+    for backend in (JsonBackend.MSGSPEC, JsonBackend.ORJSON):
+        if backend in JSON_BACKENDS:
+            return backend
+    return JsonBackend.STDLIB
+
+
+@lru_cache(maxsize=None)
+def resolve_backend(name: str) -> JsonBackend:
+    """根据配置项 api.jsonBackend 选择解码实现
+
+    名称有误或对应的库未安装时记录警告并使用可用的最快实现, 不影响程序启动。
+
+    Args:
+        name: 实现名称, 如 auto、stdlib、orjson、msgspec
+
+    Returns:
+        JsonBackend: 可用的解码实现
+    """
+    if name.lower() == "auto":
+        return default_backend()
+    backend = JsonBackend.__members__.get(name.upper())
+    if backend is None:
+        logger.warning(f"未知的 JSON 解码实现 {name}, 改用 {default_backend().name}")
+        return default_backend()
+    if backend not in JSON_BACKENDS:
+        logger.warning(f"JSON 解码实现 {backend.name} 不可用(未安装对应的库), 改用 {default_backend().name}")
+        return default_backend()
+    return backend
+
+
+class JsonDecoder:
+    """musicu.fcg 响应解码器
+
+    使用 msgspec 时, 根据请求中的模块选择响应结构, 只解码 MusicDataParser 用到的字段,
+    专辑、歌单等大响应的解码时间与峰值内存随之下降; 其他实现及未知模块完整解码。
+    """
+
+    def __init__(self, backend: JsonBackend = None):
+        """初始化解码器
+
+        Args:
+            backend: JSON 解码实现, 为空时使用可用的最快实现
+        """
+        self.backend = backend if backend is not None else default_backend()
+        if self.backend not in JSON_BACKENDS:
+            raise ValueError(f"JSON 解码实现不可用: {self.backend.name}")
+        self._loads = JSON_BACKENDS[self.backend]
+
+    def decode(self, content: bytes, payload: Dict = None) -> Any:
+        """解码响应
+
+        Args:
+            content: 响应内容
+            payload: 请求体, 用于确定各 req_N 模块的响应结构
+
+        Returns:
+            解码后的数据, 结构与 json.loads 相同(部分解码时只包含解析器用到的字段)
+        """
+        if self.backend == JsonBackend.MSGSPEC and payload:
+            modules = tuple(sorted((key, value.get("module"), value.get("method")) for key, value in payload.items()
+                                   if isinstance(value, dict) and "module" in value))
+            if any(module[1:] in MODULE_SCHEMAS for module in modules):
+                try:
+                    return _typed_decoder(modules).decode(content)
+                except msgspec.ValidationError:
+                    pass
+        return self._loads(content)
+
+
+@lru_cache(maxsize=64)
+def _typed_decoder(modules: Tuple[Tuple[str, str, str], ...]):
+    """为一组 req_N 模块创建部分解码器, 顶层只保留 code 与各模块的响应"""
+    fields = {key: MODULE_SCHEMAS.get((module, method), Any) for key, module, method in modules}
+    return msgspec.json.Decoder(TypedDict("MusicuResponse", {"code": Any, **fields}, total=False))
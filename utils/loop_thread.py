@@ -0,0 +1,71 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Coroutine, Optional
+
+from utils.http_client import http_clients
+
+
+class BackgroundLoop:
+    """后台事件循环线程
+
+    在一个常驻线程中运行事件循环，其他线程通过 submit 提交协程。
+    所有任务共用同一个事件循环，HTTP 客户端、连接池与请求合并等按事件循环保存的状态可以在任务之间复用。
+    """
+
+    def __init__(self, name: str = "asyncio-loop"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """确保后台线程与事件循环已启动"""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._run, args=(self._loop,), name=self.name, daemon=True)
+                self._thread.start()
+            return self._loop
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop):
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """提交协程到后台事件循环
+
+        Args:
+            coro: 要运行的协程
+
+        Returns:
+            Future: 可在其他线程中等待结果的 concurrent.futures.Future
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def stop(self, timeout: float = 5.0):
+        """关闭 HTTP 客户端并停止后台事件循环
+
+        Args:
+            timeout: 等待客户端关闭与线程退出的最长时间（秒）
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(http_clients.aclose(), loop).result(timeout)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+
+
+# 全局后台事件循环实例
+background_loop = BackgroundLoop()
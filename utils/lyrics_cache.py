@@ -0,0 +1,115 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.config import config
+from utils.logger import logger
+
+
+class LyricsCache:
+    """歌词持久化缓存
+
+    以 (songmid, 歌词类型) 为键，在 SQLite 中保存已解码、已解密的歌词。
+    条目超过有效期后失效，条目数超过上限时按最近访问时间淘汰。
+    """
+
+    def __init__(self, path: str | Path, ttl: float, max_entries: int, enabled: bool = True):
+        """初始化歌词缓存
+
+        Args:
+            path: 数据库文件路径
+            ttl: 有效期（秒）
+            max_entries: 最多保存的条目数
+            enabled: 是否启用
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _ensure_conn(self) -> sqlite3.Connection:
+        """确保数据库连接存在"""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS lyrics ("
+                "songmid TEXT NOT NULL, kind TEXT NOT NULL, data TEXT NOT NULL, "
+                "created REAL NOT NULL, accessed REAL NOT NULL, PRIMARY KEY (songmid, kind))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS lyrics_accessed ON lyrics (accessed)")
+        return self._conn
+
+    def get(self, songmid: str, kind: str) -> Optional[Dict]:
+        """读取缓存的歌词
+
+        Args:
+            songmid: 歌曲MID
+            kind: 歌词类型（lrc/qrc）
+
+        Returns:
+            缓存的歌词数据，不存在或已过期时返回None
+        """
+        if not self.enabled or not songmid:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._ensure_conn()
+                row = conn.execute("SELECT data FROM lyrics WHERE songmid = ? AND kind = ? AND created > ?",
+                                   (songmid, kind, now - self.ttl)).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE lyrics SET accessed = ? WHERE songmid = ? AND kind = ?", (now, songmid, kind))
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"读取歌词缓存失败: {str(e)}")
+            return None
+
+    def set(self, songmid: str, kind: str, data: Dict):
+        """写入歌词缓存，并清理过期与超出上限的条目
+
+        Args:
+            songmid: 歌曲MID
+            kind: 歌词类型（lrc/qrc）
+            data: 歌词数据
+        """
+        if not self.enabled or not songmid:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._ensure_conn()
+                conn.execute("INSERT OR REPLACE INTO lyrics VALUES (?, ?, ?, ?, ?)",
+                             (songmid, kind, json.dumps(data, ensure_ascii=False), now, now))
+                conn.execute("DELETE FROM lyrics WHERE created <= ?", (now - self.ttl,))
+                (count,) = conn.execute("SELECT COUNT(*) FROM lyrics").fetchone()
+                if count > self.max_entries:
+                    conn.execute("DELETE FROM lyrics WHERE rowid IN "
+                                 "(SELECT rowid FROM lyrics ORDER BY accessed LIMIT ?)",
+                                 (count - self.max_entries,))
+        except sqlite3.Error as e:
+            logger.warning(f"写入歌词缓存失败: {str(e)}")
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._ensure_conn().execute("DELETE FROM lyrics")
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+
+
+# 全局歌词缓存实例
+lyrics_cache = LyricsCache(config.LYRICS_CACHE_PATH, config.LYRICS_CACHE_TTL,
+                           config.LYRICS_CACHE_MAX_ENTRIES, config.LYRICS_CACHE_ENABLED)
@@ -19,4 +19,24 @@ class RequestMethod(str, Enum):
 class QrcType(Enum):
     """歌词类型枚举"""
     LOCAL = 0
-    CLOUD = 1
\ No newline at end of file
+    CLOUD = 1
+
+
+class DesBackend(Enum):
+    """Triple-DES 实现枚举"""
+    REFERENCE = 0  # 逐位计算的参考实现
+    TABLE = 1  # SP盒/置换查表实现
+    NUMPY = 2  # NumPy 向量化实现, 需要安装 numpy
+
+
+class AesBackend(Enum):
+    """AES 实现枚举"""
+    PYAES = 0  # 纯 Python 实现
+    CRYPTOGRAPHY = 1  # cryptography 库, 需要额外安装
+
+
+class JsonBackend(Enum):
+    """JSON 解码实现枚举"""
+    STDLIB = 0  # 标准库 json
+    ORJSON = 1  # orjson, 需要安装 orjson
+    MSGSPEC = 2  # msgspec, 需要安装 msgspec, 支持按字段结构只解码解析器用到的字段
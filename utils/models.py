@@ -0,0 +1,84 @@
+import sys
+from dataclasses import dataclass
+from typing import Any, Tuple
+
+from utils.schema import Each, Field, Record
+
+
+class DictAccessMixin:
+    """为数据类提供与 dict 相同的只读访问方式，兼容 song['name']、song.get('interval', 0) 等写法"""
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self.__dataclass_fields__ else default
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__dataclass_fields__
+
+    def keys(self):
+        return self.__dataclass_fields__.keys()
+
+
+@dataclass(slots=True)
+class Singer(DictAccessMixin):
+    """歌手"""
+    id: int | str
+    mid: str
+    name: str
+
+
+@dataclass(slots=True)
+class AlbumRef(DictAccessMixin):
+    """歌曲所属专辑"""
+    id: int | str
+    mid: str
+    name: str
+
+
+@dataclass(slots=True)
+class Song(DictAccessMixin):
+    """歌曲
+
+    解析搜索结果、专辑与歌单时使用，代替每首歌一个嵌套 dict；歌手与专辑的 mid 会被驻留，
+    同一歌手、专辑的多首歌曲共享同一个字符串对象。
+    """
+    id: int | str
+    mid: str
+    name: str
+    singer: Tuple[Singer, ...]
+    album: AlbumRef
+    interval: int = 0
+
+
+def _intern(value: Any) -> Any:
+    """驻留字符串，非字符串（如 null）原样返回"""
+    return sys.intern(value) if type(value) is str else value
+
+
+SINGER_SPEC = Record({
+    'id': Field('id', ''),
+    'mid': Field('mid', '', convert=_intern),
+    'name': Field('name', ''),
+}, factory=Singer)
+
+ALBUM_REF_FIELDS = {
+    'id': Field('id', ''),
+    'mid': Field('mid', '', convert=_intern),
+    'name': Field('name', ''),
+}
+
+# 歌曲条目的字段，搜索结果、歌单与专辑（songInfo）中的歌曲结构相同
+SONG_FIELDS = {
+    'id': Field('id', ''),
+    'mid': Field('mid', '', convert=_intern),
+    'name': Field('name', ''),
+    'singer': Each('singer', SINGER_SPEC, container=tuple),
+    'album': Record(ALBUM_REF_FIELDS, path='album', factory=AlbumRef, required=True),
+    'interval': Field('interval', 0),
+}
+SONG_SPEC = Record(SONG_FIELDS, factory=Song)
@@ -3,34 +3,28 @@ from typing import Optional, Dict, Any
 import httpx
 import urllib3
 
+from utils.http_client import http_clients
+
 
 class NetworkManager:
     """网络请求管理类"""
 
     def __init__(self):
         self.client = self._setup_client()
-        self.async_client = None
+        self.http_clients = http_clients
 
     def _setup_client(self) -> httpx.Client:
         """配置同步客户端"""
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         return httpx.Client(verify=False, trust_env=False, timeout=10.0)
 
-    async def _ensure_async_client(self):
-        """确保异步客户端存在"""
-        if self.async_client is None:
-            self.async_client = httpx.AsyncClient(limits=httpx.Limits(max_connections=100,
-                                                                      max_keepalive_connections=20),
-                                                  verify=False,
-                                                  trust_env=False,
-                                                  timeout=10.0)
-        return self.async_client
+    async def _ensure_async_client(self, url: str) -> httpx.AsyncClient:
+        """获取访问指定地址的共享异步客户端"""
+        return self.http_clients.get(url, verify=False, trust_env=False)
 
     async def close(self):
-        """关闭异步客户端"""
-        if self.async_client:
-            await self.async_client.aclose()
-            self.async_client = None
+        """关闭当前事件循环中的共享异步客户端"""
+        await self.http_clients.aclose()
 
     def get(self, url: str, **kwargs) -> Optional[httpx.Response]:
         """发送同步GET请求"""
@@ -44,7 +38,7 @@ class NetworkManager:
                         headers: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
         """发送异步GET请求"""
         try:
-            client = await self._ensure_async_client()
+            client = await self._ensure_async_client(url)
             response = await client.get(url, params=params, headers=headers)
             if response.status_code != 200:
                 return None
@@ -57,7 +51,7 @@ class NetworkManager:
                              headers: Optional[Dict] = None) -> Optional[str]:
         """发送异步GET请求并返回文本"""
         try:
-            client = await self._ensure_async_client()
+            client = await self._ensure_async_client(url)
             response = await client.get(url, params=params, headers=headers)
             if response.status_code != 200:
                 return None
@@ -70,7 +64,7 @@ class NetworkManager:
                          headers: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
         """发送异步POST请求"""
         try:
-            client = await self._ensure_async_client()
+            client = await self._ensure_async_client(url)
             response = await client.post(url, data=data, headers=headers)
             if response.status_code != 200:
                 return None
@@ -82,7 +76,7 @@ class NetworkManager:
     async def async_get_bytes(self, url: str, headers: Optional[Dict] = None) -> Optional[bytes]:
         """发送异步GET请求并返回二进制数据"""
         try:
-            client = await self._ensure_async_client()
+            client = await self._ensure_async_client(url)
             response = await client.get(url, headers=headers)
             if response.status_code != 200:
                 return None
@@ -1,7 +1,86 @@
 import base64
 from typing import Dict
-from decryptor import qrc_decrypt
+from decryptor.service import decrypt_service
 from utils.menum import QrcType, SearchType
+from utils.models import SONG_FIELDS, SONG_SPEC, Song
+from utils.schema import Each, Field, ParseError, Record, compile_spec, compile_stream
+
+# 搜索、歌单与专辑接口的解析规格，字段缺失时取默认值；模块失败（缺少 data 或歌曲列表）或结构不符时返回 code -1 与出错路径
+SEARCH_SONG_SPEC = {
+    'code': Field('code', -1),
+    'songs': Each('req_0.data.body.song.list', SONG_SPEC, required=True),
+}
+
+SEARCH_ALBUM_SPEC = {
+    'code': Field('code', -1),
+    'albums': Each('req_0.data.body.album.list', {
+        'albumID': Field('albumID', ''),
+        'albumMID': Field('albumMID', ''),
+        'albumName': Field('albumName', ''),
+        'albumPic': Field('albumPic', ''),
+        'publicTime': Field('publicTime', ''),
+        'singerID': Field('singerID', ''),
+        'singerMID': Field('singerMID', ''),
+        'singerName': Field('singerName', ''),
+        'song_count': Field('song_count', 0),
+    }, required=True),
+}
+
+SEARCH_SONGLIST_SPEC = {
+    'code': Field('code', -1),
+    'playlists': Each('req_0.data.body.songlist.list', {
+        'dissid': Field('dissid', ''),
+        'dissname': Field('dissname', ''),
+        'imgurl': Field('imgurl', ''),
+        'introduction': Field('introduction', ''),
+        'listennum': Field('listennum', 0),
+        'song_count': Field('song_count', 0),
+        'creator': Record({
+            'name': Field('name', ''),
+            'qq': Field('qq', 0),
+            'isVip': Field('isVip', 0),
+        }, path='creator'),
+        'createtime': Field('createtime', ''),
+    }, required=True),
+}
+
+PLAYLIST_SONGS_SPEC = Each('req_0.data.songlist', SONG_SPEC, required=True)
+
+PLAYLIST_SPEC = {
+    'code': Field('code', -1),
+    'id': Field('req_0.data.dirinfo.id', ''),
+    'name': Field('req_0.data.dirinfo.title', ''),
+    'desc': Field('req_0.data.dirinfo.desc', ''),
+    'picurl': Field('req_0.data.dirinfo.picurl', ''),
+    'total_song_num': Field('req_0.data.total_song_num', 0),
+    'songs': PLAYLIST_SONGS_SPEC,
+}
+
+ALBUM_SONGS_SPEC = Each('req_0.data.songList', Record(SONG_FIELDS, path='songInfo', factory=Song, required=True),
+                        required=True)
+
+ALBUM_SPEC = {
+    'code': Field('code', -1),
+    'albumMid': Field('req_0.data.albumMid', ''),
+    'totalNum': Field('req_0.data.totalNum', 0),
+    'songList': ALBUM_SONGS_SPEC,
+}
+
+_SEARCH_PARSERS = {
+    SearchType.SONG: compile_spec(SEARCH_SONG_SPEC),
+    SearchType.ALBUM: compile_spec(SEARCH_ALBUM_SPEC),
+    SearchType.SONGLIST: compile_spec(SEARCH_SONGLIST_SPEC),
+}
+_parse_playlist = compile_spec(PLAYLIST_SPEC)
+_parse_album = compile_spec(ALBUM_SPEC)
+
+# 分页获取时只解析页头，歌曲在迭代时逐首解析
+_parse_playlist_page = compile_spec({'code': PLAYLIST_SPEC['code'],
+                                     'total_song_num': PLAYLIST_SPEC['total_song_num']})
+_parse_album_page = compile_spec({'code': ALBUM_SPEC['code'], 'totalNum': ALBUM_SPEC['totalNum']})
+_stream_playlist_songs = compile_stream(PLAYLIST_SONGS_SPEC)
+_stream_album_songs = compile_stream(ALBUM_SONGS_SPEC)
+
 
 class MusicDataParser:
     """音乐数据解析器"""
@@ -16,82 +95,12 @@ class MusicDataParser:
         Returns:
             Dict: 解析后的搜索结果，包含歌曲列表等信息
         """
+        parse = _SEARCH_PARSERS.get(search_type)
+        if parse is None:
+            return {'code': -1, 'error': f'不支持的搜索类型: {search_type}'}
         try:
-            match search_type:
-                case SearchType.SONG:
-                    result = {
-                        'code': json_data.get('code', -1),
-                        'songs': []
-                    }
-                    
-                    if 'req_0' in json_data and 'data' in json_data['req_0']:
-                        song_list = json_data['req_0']['data']['body']['song']['list']
-                        for song in song_list:
-                            song_info = {
-                                'id': song.get('id', ''),
-                                'mid': song.get('mid', ''),
-                                'name': song.get('name', ''),
-                                'singer': [{
-                                    'id': s.get('id', ''),
-                                    'mid': s.get('mid', ''),
-                                    'name': s.get('name', '')
-                                } for s in song.get('singer', [])],
-                                'album': {
-                                    'id': song['album'].get('id', ''),
-                                    'mid': song['album'].get('mid', ''),
-                                    'name': song['album'].get('name', '')
-                                },
-                                'interval': song.get('interval', 0)
-                            }
-                            result['songs'].append(song_info)
-                case SearchType.ALBUM:
-                    result = {
-                        'code': json_data.get('code', -1),
-                        'albums': []
-                    }
-                    
-                    if 'req_0' in json_data and 'data' in json_data['req_0']:
-                        album_list = json_data['req_0']['data']['body']['album']['list']
-                        for album in album_list:
-                            album_info = {
-                                'albumID': album.get('albumID', ''),
-                                'albumMID': album.get('albumMID', ''),
-                                'albumName': album.get('albumName', ''),
-                                'albumPic': album.get('albumPic', ''),
-                                'publicTime': album.get('publicTime', ''),
-                                'singerID': album.get('singerID', ''),
-                                'singerMID': album.get('singerMID', ''),
-                                'singerName': album.get('singerName', ''),
-                                'song_count': album.get('song_count', 0)
-                            }
-                            result['albums'].append(album_info)
-                case SearchType.SONGLIST:
-                    result = {
-                        'code': json_data.get('code', -1),
-                        'playlists': []
-                    }
-                    
-                    if 'req_0' in json_data and 'data' in json_data['req_0']:
-                        playlist_list = json_data['req_0']['data']['body']['songlist']['list']
-                        for playlist in playlist_list:
-                            creator = playlist.get('creator', {})
-                            playlist_info = {
-                                'dissid': playlist.get('dissid', ''),
-                                'dissname': playlist.get('dissname', ''),
-                                'imgurl': playlist.get('imgurl', ''),
-                                'introduction': playlist.get('introduction', ''),
-                                'listennum': playlist.get('listennum', 0),
-                                'song_count': playlist.get('song_count', 0),
-                                'creator': {
-                                    'name': creator.get('name', ''),
-                                    'qq': creator.get('qq', 0),
-                                    'isVip': creator.get('isVip', 0)
-                                },
-                                'createtime': playlist.get('createtime', '')
-                            }
-                            result['playlists'].append(playlist_info)
-            return result
-        except Exception as e:
+            return parse(json_data)
+        except ParseError as e:
             return {'code': -1, 'error': str(e)}
 
     @staticmethod
@@ -132,7 +141,7 @@ class MusicDataParser:
             json_data (Dict): 歌曲URL的原始JSON数据
             
         Returns:
-            Dict: 解析后的歌曲URL数据，包含下载链接
+            Dict: 解析后的歌曲URL数据，包含下载链接与 vkey 有效期（秒）
         """
         try:
             result = {
@@ -162,13 +171,52 @@ class MusicDataParser:
                     full_url = 'https://' + full_url[7:]
                     
                 result['url'] = full_url
+                result['expiration'] = data.get('expiration', 0)
+                
+            return result
+        except Exception as e:
+            return {'code': -1, 'error': str(e)}
+
+    @staticmethod
+    def parse_song_urls(json_data: Dict) -> Dict:
+        """解析批量获取的歌曲下载链接
+        
+        Args:
+            json_data (Dict): 歌曲URL的原始JSON数据
+            
+        Returns:
+            Dict: 解析后的数据，urls 为歌曲MID到下载链接的映射，expiration 为 vkey 有效期（秒）
+        """
+        try:
+            result = {
+                'code': json_data.get('code', -1),
+                'urls': {},
+                'expiration': 0
+            }
+            
+            if 'req_1' in json_data and 'data' in json_data['req_1']:
+                data = json_data['req_1']['data']
+                
+                sip_list = data.get('sip', [])
+                if not sip_list:
+                    return {'code': -1, 'error': '未找到服务器地址'}
+                base_url = sip_list[0]
+                result['expiration'] = data.get('expiration', 0)
+                
+                for info in data.get('midurlinfo', []):
+                    if not info.get('purl'):
+                        continue
+                    full_url = base_url + info['purl']
+                    if full_url.startswith('http://'):
+                        full_url = 'https://' + full_url[7:]
+                    result['urls'][info['songmid']] = full_url
                 
             return result
         except Exception as e:
             return {'code': -1, 'error': str(e)}
 
     @staticmethod
-    def parse_word_by_word_lyrics(json_data: Dict) -> Dict:
+    async def parse_word_by_word_lyrics(json_data: Dict) -> Dict:
         """解析逐字歌词数据
         
         Args:
@@ -188,20 +236,18 @@ class MusicDataParser:
             if 'music.musichallSong.PlayLyricInfo.GetPlayLyricInfo' in json_data:
                 data = json_data['music.musichallSong.PlayLyricInfo.GetPlayLyricInfo']['data']
                 
-                # 解密原文歌词
+                # 原文、翻译与罗马音歌词一并提交给解密服务
+                fields = []
                 if 'lyric' in data:
-                    encrypted_lyric = data['lyric']
-                    result['lyric'] = qrc_decrypt(encrypted_lyric, QrcType.CLOUD)
-                
-                # 解密翻译歌词
+                    fields.append('lyric')
                 if 'trans' in data and data['trans']:
-                    encrypted_trans = data['trans']
-                    result['trans'] = qrc_decrypt(encrypted_trans, QrcType.CLOUD)
-                
-                # 解密罗马音歌词
+                    fields.append('trans')
                 if 'roma' in data and data['roma']:
-                    encrypted_roma = data['roma']
-                    result['roma'] = qrc_decrypt(encrypted_roma, QrcType.CLOUD)
+                    fields.append('roma')
+
+                if fields:
+                    decrypted = await decrypt_service.qrc_decrypt_many([data[name] for name in fields], QrcType.CLOUD)
+                    result.update(zip(fields, decrypted))
             
             return result
         except Exception as e:
@@ -218,48 +264,8 @@ class MusicDataParser:
             Dict: 解析后的歌单数据，包含歌单信息和歌曲列表
         """
         try:
-            result = {
-                'code': json_data.get('code', -1),
-                'id': '',
-                'name': '',
-                'desc': '',
-                'picurl': '',
-                'total_song_num': 0,
-                'songs': []
-                
-            }
-            
-            if 'req_0' in json_data and 'data' in json_data['req_0']:
-                playlist_data = json_data['req_0']['data']
-                result.update({
-                    'id': playlist_data.get('dirinfo', '').get('id', ''),
-                    'name': playlist_data.get('dirinfo', '').get('title', ''),
-                    'desc': playlist_data.get('dirinfo', '').get('desc', ''),
-                    'picurl': playlist_data.get('dirinfo', '').get('picurl', ''),
-                })
-                
-                # 解析歌曲列表
-                if 'songlist' in playlist_data:
-                    for song in playlist_data['songlist']:
-                        song_info = {
-                            'id': song.get('id', ''),
-                            'mid': song.get('mid', ''),
-                            'name': song.get('name', ''),
-                            'singer': [{
-                                'id': s.get('id', ''),
-                                'mid': s.get('mid', ''),
-                                'name': s.get('name', '')
-                            } for s in song.get('singer', [])],
-                            'album': {
-                                'id': song['album'].get('id', ''),
-                                'mid': song['album'].get('mid', ''),
-                                'name': song['album'].get('name', '')
-                            }
-                        }
-                        result['songs'].append(song_info)
-            
-            return result
-        except Exception as e:
+            return _parse_playlist(json_data)
+        except ParseError as e:
             return {'code': -1, 'error': str(e)}
 
     @staticmethod
@@ -273,41 +279,40 @@ class MusicDataParser:
             Dict: 解析后的专辑数据，包含专辑信息和歌曲列表
         """
         try:
-            result = {
-                'code': json_data.get('code', -1),
-                'albumMid': '',
-                'totalNum': 0,
-                'songList': []
-            }
-            
-            if 'req_0' in json_data and 'data' in json_data['req_0']:
-                album_data = json_data['req_0']['data']
-                result['albumMid'] = album_data.get('albumMid', '')
-                result['totalNum'] = album_data.get('totalNum', 0)
-                
-                # 解析歌曲列表
-                if 'songList' in album_data:
-                    for song in album_data['songList']:
-                        songInfo = song['songInfo']
+            return _parse_album(json_data)
+        except ParseError as e:
+            return {'code': -1, 'error': str(e)} 
 
-                        song_info = {
-                            'id': songInfo.get('id', ''),
-                            'mid': songInfo.get('mid', ''),
-                            'name': songInfo.get('name', ''),
-                            'singer': [{
-                                'id': s.get('id', ''),
-                                'mid': s.get('mid', ''),
-                                'name': s.get('name', '')
-                            } for s in songInfo.get('singer', [])],
-                            'album': {
-                                'id': songInfo['album'].get('id', ''),
-                                'mid': songInfo['album'].get('mid', ''),
-                                'name': songInfo['album'].get('name', '')
-                            },
-                            'interval': songInfo.get('interval', 0)
-                        }
-                        result['songList'].append(song_info)
-            
+    @staticmethod
+    def parse_playlist_page(json_data: Dict) -> Dict:
+        """解析分页获取的歌单数据
+
+        Args:
+            json_data (Dict): 歌单的原始JSON数据
+
+        Returns:
+            Dict: 包含 code、total_song_num 与 songs，songs 为逐首解析歌曲的迭代器
+        """
+        try:
+            result = _parse_playlist_page(json_data)
+            result['songs'] = _stream_playlist_songs(json_data)
             return result
-        except Exception as e:
-            return {'code': -1, 'error': str(e)} 
\ No newline at end of file
+        except ParseError as e:
+            return {'code': -1, 'error': str(e)}
+
+    @staticmethod
+    def parse_album_page(json_data: Dict) -> Dict:
+        """解析分页获取的专辑数据
+
+        Args:
+            json_data (Dict): 专辑的原始JSON数据
+
+        Returns:
+            Dict: 包含 code、totalNum 与 songList，songList 为逐首解析歌曲的迭代器
+        """
+        try:
+            result = _parse_album_page(json_data)
+            result['songList'] = _stream_album_songs(json_data)
+            return result
+        except ParseError as e:
+            return {'code': -1, 'error': str(e)}
@@ -0,0 +1,326 @@
+"""字段路径解析规格
+
+用声明式的规格描述如何从接口返回的 JSON 中提取字段，规格经 compile_spec 预编译为取值闭包，
+解析时不再重复解释路径与规格。
+
+    SONG = Record({
+        'mid': Field('mid', '', convert=sys.intern),
+        'singer': Each('singer', Record({'name': Field('name', '')})),
+        'album': Record({'name': Field('name', '')}, path='album', required=True),
+    })
+    parse_song = compile_spec(SONG)
+
+列表规格也可以经 compile_stream 编译为逐个提取元素的函数，用于边解析边处理的大列表。
+路径以 "." 分隔，数字段表示列表下标，空路径表示当前对象。
+字段缺失时使用默认值，数据结构与规格不符（如期望对象却得到字符串）或缺少必需字段时抛出 ParseError，
+错误信息包含出错位置的完整路径。
+"""
+import dataclasses
+from typing import Any, Callable, Dict, Iterator, Tuple, Union
+
+_MISSING = object()
+
+
+class SchemaError(ValueError):
+    """规格定义错误，在编译规格时抛出"""
+
+
+class ParseError(ValueError):
+    """数据与规格不符"""
+
+    def __init__(self, path: str, message: str):
+        super().__init__(f"{path or '<root>'}: {message}")
+        self.path = path
+
+
+class Field:
+    """提取单个字段"""
+    __slots__ = ("path", "default", "convert", "required")
+
+    def __init__(self, path: Union[str, Tuple] = "", default: Any = None, convert: Callable[[Any], Any] = None,
+                 required: bool = False):
+        """
+        Args:
+            path: 字段路径
+            default: 字段缺失时的默认值，list/dict 每次返回副本
+            convert: 对取到的值进行转换
+            required: 是否为必需字段，缺失时抛出 ParseError
+        """
+        self.path = path
+        self.default = default
+        self.convert = convert
+        self.required = required
+
+
+class Each:
+    """对列表中的每个元素应用子规格"""
+    __slots__ = ("path", "item", "container", "required")
+
+    def __init__(self, path: Union[str, Tuple], item: "Spec", container: Callable = list, required: bool = False):
+        """
+        Args:
+            path: 列表路径，为 null 或缺失且非必需时返回空容器
+            item: 元素规格，路径相对于元素
+            container: 结果容器类型，如 list、tuple
+            required: 是否为必需列表，缺失时抛出 ParseError
+        """
+        self.path = path
+        self.item = item
+        self.container = container
+        self.required = required
+
+
+class Record:
+    """由多个字段组成的对象"""
+    __slots__ = ("fields", "path", "factory", "required")
+
+    def __init__(self, fields: Dict[str, "Spec"], path: Union[str, Tuple] = "", factory: Callable = dict,
+                 required: bool = False):
+        """
+        Args:
+            fields: 输出字段名到子规格的映射，子规格路径相对于本对象
+            path: 对象路径，缺失或为 null 且非必需时按空对象提取（各字段取默认值）
+            factory: 以各字段为关键字参数创建结果的可调用对象，如 dict 或数据类
+            required: 是否为必需对象，缺失时抛出 ParseError
+        """
+        self.fields = fields
+        self.path = path
+        self.factory = factory
+        self.required = required
+
+
+Spec = Union[Field, Each, Record, Dict[str, Any], str]
+
+
+def _split_path(path: Union[str, Tuple], where: str) -> Tuple:
+    if isinstance(path, str):
+        keys = path.split(".") if path else []
+        return tuple(int(key) if key.lstrip("-").isdigit() else key for key in keys)
+    if isinstance(path, tuple) and all(isinstance(key, (str, int)) for key in path):
+        return path
+    raise SchemaError(f"{where}: 路径必须是字符串或由 str/int 组成的元组，实际为 {path!r}")
+
+
+def _join(where: str, path: Tuple) -> str:
+    suffix = ".".join(str(key) for key in path)
+    return f"{where}.{suffix}" if where and suffix else where or suffix
+
+
+def _compile_path(keys: Tuple, where: str) -> Callable[[Any], Any]:
+    """编译路径为取值函数，字段缺失时返回 _MISSING"""
+    if not keys:
+        return lambda data: data
+
+    if len(keys) == 1 and isinstance(keys[0], str):
+        key = keys[0]
+
+        def get_one(data):
+            if isinstance(data, dict):
+                return data.get(key, _MISSING)
+            if data is None:
+                return _MISSING
+            raise ParseError(where, f"期望对象，实际为 {type(data).__name__}")
+        return get_one
+
+    def get(data):
+        for key in keys:
+            if isinstance(data, dict) and isinstance(key, str):
+                data = data.get(key, _MISSING)
+            elif isinstance(data, list) and isinstance(key, int):
+                data = data[key] if -len(data) <= key < len(data) else _MISSING
+            elif data is None:
+                return _MISSING
+            else:
+                raise ParseError(where, f"无法在 {type(data).__name__} 中取 {key!r}")
+            if data is _MISSING:
+                return _MISSING
+        return data
+    return get
+
+
+def _normalize(spec: Spec, where: str) -> Union[Field, Each, Record]:
+    if isinstance(spec, (Field, Each, Record)):
+        return spec
+    if isinstance(spec, str):
+        return Field(spec)
+    if isinstance(spec, dict):
+        return Record(spec)
+    raise SchemaError(f"{where}: 不支持的规格类型 {type(spec).__name__}")
+
+
+def _compile(spec: Spec, where: str) -> Callable[[Any], Any]:
+    """编译规格为接收父对象的函数"""
+    spec = _normalize(spec, where)
+    keys = _split_path(spec.path, where)
+    where = _join(where, keys)
+    get = _compile_path(keys, where)
+
+    if isinstance(spec, Field):
+        return _compile_field(spec, keys, where, get)
+
+    extract = _compile_each(spec, where) if isinstance(spec, Each) else _compile_record(spec, where)
+    if not keys:
+        return extract
+    if len(keys) == 1 and isinstance(keys[0], str):
+        key = keys[0]
+        return lambda data: extract(data.get(key, _MISSING) if type(data) is dict else get(data))
+    return lambda data: extract(get(data))
+
+
+def _or_default(value: Any, default: Any) -> Any:
+    return default if value is _MISSING else value
+
+
+def _compile_field(spec: Field, keys: Tuple, where: str, get: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    default, convert, required = spec.default, spec.convert, spec.required
+    if convert is not None and not callable(convert):
+        raise SchemaError(f"{where}: convert 必须可调用")
+    copy_default = isinstance(default, (list, dict))
+
+    if len(keys) == 1 and isinstance(keys[0], str) and not required and not copy_default:
+        # 最常见的情形：当前对象上的可选字段，直接用 dict.get 取值
+        key = keys[0]
+        if convert is None:
+            return lambda data: data.get(key, default) if type(data) is dict else _or_default(get(data), default)
+
+        def converted(data):
+            value = data.get(key, _MISSING) if type(data) is dict else get(data)
+            if value is _MISSING:
+                return default
+            try:
+                return convert(value)
+            except (TypeError, ValueError) as e:
+                raise ParseError(where, f"转换失败: {e}") from e
+        return converted
+
+    def field(data):
+        value = get(data)
+        if value is _MISSING:
+            if required:
+                raise ParseError(where, "缺少必需字段")
+            return default.copy() if copy_default else default
+        if convert is None:
+            return value
+        try:
+            return convert(value)
+        except (TypeError, ValueError) as e:
+            raise ParseError(where, f"转换失败: {e}") from e
+    return field
+
+
+def _compile_each(spec: Each, where: str) -> Callable[[Any], Any]:
+    """编译列表规格为接收列表本身（可能为 _MISSING）的函数"""
+    item = _compile(spec.item, f"{where}[]")
+    container, required = spec.container, spec.required
+
+    def each(value):
+        if value is _MISSING and required:
+            raise ParseError(where, "缺少必需列表")
+        if value is _MISSING or value is None:
+            return container()
+        if not isinstance(value, list):
+            raise ParseError(where, f"期望列表，实际为 {type(value).__name__}")
+        items = [item(element) for element in value]
+        return items if container is list else container(items)
+    return each
+
+
+def _compile_record(spec: Record, where: str) -> Callable[[Any], Any]:
+    """编译对象规格为接收对象本身（可能为 _MISSING）的函数"""
+    if not isinstance(spec.fields, dict) or not all(isinstance(name, str) for name in spec.fields):
+        raise SchemaError(f"{where}: fields 必须是以字符串为键的 dict")
+    names = list(spec.fields)
+    factory = spec.factory
+    positional = False
+    if dataclasses.is_dataclass(factory):
+        init_names = [f.name for f in dataclasses.fields(factory) if f.init]
+        unknown = set(names) - set(init_names)
+        if unknown:
+            raise SchemaError(f"{where}: {factory.__name__} 没有字段 {', '.join(sorted(unknown))}")
+        missing = {f.name for f in dataclasses.fields(factory) if f.init and
+                   f.default is dataclasses.MISSING and f.default_factory is dataclasses.MISSING} - set(names)
+        if missing:
+            raise SchemaError(f"{where}: 缺少 {factory.__name__} 的必需字段 {', '.join(sorted(missing))}")
+        # 规格覆盖数据类的前若干个字段时按位置传参，比关键字参数快
+        if set(init_names[:len(names)]) == set(names):
+            names = init_names[:len(names)]
+            positional = True
+
+    getters = tuple(_compile(spec.fields[name], where) for name in names)
+    items = tuple(zip(names, getters))
+    required = spec.required
+
+    def check(value):
+        if value is _MISSING or value is None:
+            if required:
+                raise ParseError(where, "缺少必需对象")
+            return {}
+        if not isinstance(value, dict):
+            raise ParseError(where, f"期望对象，实际为 {type(value).__name__}")
+        return value
+
+    if factory is dict:
+        def record(value):
+            if type(value) is not dict:
+                value = check(value)
+            return {name: get(value) for name, get in items}
+    elif positional:
+        def record(value):
+            if type(value) is not dict:
+                value = check(value)
+            return factory(*[get(value) for get in getters])
+    else:
+        def record(value):
+            if type(value) is not dict:
+                value = check(value)
+            return factory(**{name: get(value) for name, get in items})
+    return record
+
+
+def compile_spec(spec: Spec) -> Callable[[Any], Any]:
+    """编译规格
+
+    Args:
+        spec: 解析规格
+
+    Returns:
+        Callable: 接收 JSON 数据、返回提取结果的函数
+
+    Raises:
+        SchemaError: 规格定义有误
+    """
+    return _compile(spec, "")
+
+
+def compile_stream(spec: Each) -> Callable[[Any], Iterator[Any]]:
+    """编译列表规格为逐个提取元素的函数，不构建完整的结果列表
+
+    列表的路径与类型在调用时立即检查，元素在迭代时才逐个提取。
+
+    Args:
+        spec: 列表规格
+
+    Returns:
+        Callable: 接收 JSON 数据、返回元素提取结果迭代器的函数
+
+    Raises:
+        SchemaError: 规格定义有误
+    """
+    if not isinstance(spec, Each):
+        raise SchemaError("compile_stream 只接受 Each 规格")
+    keys = _split_path(spec.path, "")
+    where = _join("", keys)
+    get = _compile_path(keys, where)
+    item = _compile(spec.item, f"{where}[]")
+    required = spec.required
+
+    def stream(data):
+        value = get(data)
+        if value is _MISSING and required:
+            raise ParseError(where, "缺少必需列表")
+        if value is _MISSING or value is None:
+            return iter(())
+        if not isinstance(value, list):
+            raise ParseError(where, f"期望列表，实际为 {type(value).__name__}")
+        return map(item, value)
+    return stream